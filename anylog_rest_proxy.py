@@ -21,7 +21,7 @@ Endpoints exposed to the dashboard:
     POST /api/query/increment    { dbms, table, timeColumn,
                                    startTime, endTime,
                                    timeUnit, intervalLength, projections }
-    POST /api/command            { command [, timeout] }
+    POST /api/command            { command [, timeout] [, parse] }
     GET  /api/databases
     GET  /api/databases/<dbms>/tables
     GET  /api/databases/<dbms>/tables/<table>/columns
@@ -37,41 +37,96 @@ Endpoints exposed to the dashboard:
 Usage
 -----
     pip install flask flask-cors requests
+    pip install orjson                                               # optional, faster JSON
+    pip install flask-compress                                       # optional, gzip responses
     python anylog_rest_proxy.py                                      # :8080
     python anylog_rest_proxy.py --port 5050
     python anylog_rest_proxy.py --anylog-ip 172.79.89.206 --anylog-port 32049
     python anylog_rest_proxy.py --debug
+    python anylog_rest_proxy.py --pool-size 128                      # busy dashboards
+
+Concurrency
+-----------
+Requests are served by Flask's threaded WSGI server; each handler blocks on
+one pooled keep-alive connection to the AnyLog node.  --pool-size bounds how
+many of those connections are kept open, so size it to the number of
+dashboard requests you expect in flight at once.
+
+For production, serve `app` with gunicorn's threaded worker instead of the
+Werkzeug dev server.  Configure it through ANYLOG_IP, ANYLOG_PORT, TIMEOUT,
+POOL_SIZE and CACHE_TTL; CLI flags only apply to `python anylog_rest_proxy.py`:
+
+    pip install gunicorn
+    ANYLOG_IP=172.79.89.206 ANYLOG_PORT=32049 POOL_SIZE=64 \
+        gunicorn -w 1 -k gthread --threads 64 -b 0.0.0.0:8080 anylog_rest_proxy:app
+
+Stats, the metadata cache, request coalescing and the connection pool are
+per-process.  Scale with --threads first; with -w N each worker keeps its
+own copies and /stats reports only the worker that answered.
 
 Set the Dashboard "Proxy URL" to:
     http://localhost:8080    (replace 8080 with your --port value)
 """
 
 import argparse
+import atexit
+import itertools
 import json
 import logging
+import logging.handlers
+import math
 import os
+import queue
+import socket
 import sys
+import threading
 import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
 from datetime import datetime, timezone
 
 import re
 
 import requests
 import urllib3
-from flask import Flask, jsonify, request
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from flask import Flask, jsonify, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 
+try:
+    import orjson      # optional C JSON codec: pip install orjson
+except ImportError:
+    orjson = None
+
+try:
+    from flask_compress import Compress   # optional gzip/br: pip install flask-compress
+except ImportError:
+    Compress = None
+
 # ---------------------------------------------------------------------------
 # Logging
 # ---------------------------------------------------------------------------
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler("anylog_proxy.log", encoding="utf-8"),
-    ],
-)
+# Handlers write on a QueueListener thread; request threads only enqueue.
+_LOG_FMT = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+_log_sinks = [
+    logging.StreamHandler(sys.stdout),
+    logging.FileHandler("anylog_proxy.log", encoding="utf-8"),
+]
+for _h in _log_sinks:
+    _h.setFormatter(_LOG_FMT)
+
+_log_queue = queue.SimpleQueue()
+_log_qh    = logging.handlers.QueueHandler(_log_queue)
+_log_qh.setFormatter(logging.Formatter("%(message)s"))   # full format on the sinks
+logging.basicConfig(level=logging.INFO, handlers=[_log_qh])
+
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_sinks)
+_log_listener.start()
+atexit.register(_log_listener.stop)     # flush queued records on shutdown
+
 log = logging.getLogger("anylog-proxy")
 
 # ---------------------------------------------------------------------------
@@ -79,6 +134,24 @@ log = logging.getLogger("anylog-proxy")
 # ---------------------------------------------------------------------------
 app = Flask(__name__)
 
+
+if orjson is not None:
+    class ORJSONProvider(DefaultJSONProvider):
+        """jsonify() / get_json() through orjson; Flask's default() for other types."""
+
+        def dumps(self, obj, **kwargs) -> str:
+            option = orjson.OPT_NON_STR_KEYS
+            if kwargs.get("sort_keys", self.sort_keys):
+                option |= orjson.OPT_SORT_KEYS
+            if kwargs.get("indent"):
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, default=self.default, option=option).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = ORJSONProvider(app)
+
 # IMPORTANT: use simple CORS(app), NOT CORS(app, resources={...}).
 # The resources={} form only fires after Flask routing resolves the endpoint.
 # That means an OPTIONS preflight reaches the router first, finds no handler,
@@ -93,6 +166,18 @@ CORS(
     max_age=86400,
 )
 
+# JSON results (repeated column names, timestamps) compress 5-10x.  Streamed
+# /api/query bodies are excluded here — Flask-Compress would buffer them —
+# and gzipped chunk by chunk in _relay() instead.
+if Compress is not None:
+    app.config.update(
+        COMPRESS_MIMETYPES=["application/json"],
+        COMPRESS_LEVEL=4,
+        COMPRESS_MIN_SIZE=1024,
+        COMPRESS_STREAMS=False,
+    )
+    Compress(app)
+
 # ---------------------------------------------------------------------------
 # Runtime config  (populated by argparse / env-vars in main())
 # ---------------------------------------------------------------------------
@@ -100,8 +185,19 @@ CFG = {
     "anylog_ip":   "172.79.89.206",
     "anylog_port": 32049,
     "timeout":     60.0,
+    "pool_size":   64,
+    "cache_ttl":   30.0,   # seconds; metadata endpoints only, 0 disables
+    "_url":        None,   # derived from anylog_ip/port by _set_node_url()
 }
 
+
+def _set_node_url() -> None:
+    """Recompute the cached AnyLog base URL; call after changing ip/port."""
+    CFG["_url"] = f"http://{CFG['anylog_ip']}:{CFG['anylog_port']}"
+
+
+_set_node_url()
+
 # ---------------------------------------------------------------------------
 # Stats counters
 # ---------------------------------------------------------------------------
@@ -110,12 +206,84 @@ _stats = {
     "anylog_calls":  0,
     "total_rows":    0,
     "errors":        0,
+    "cache_hits":    0,
+    "cache_misses":  0,
     "start_time":    time.time(),
-    "_latencies":    [],   # rolling last-50 for average
+    "_latencies":    deque(maxlen=50),   # rolling last-50 for average
+    "_lat_sum":      0,                  # running sum of _latencies
 }
+# Flask serves requests on several threads; += on a dict value is not atomic.
+_STATS_LOCK = threading.Lock()
+
+
+def _bump(key: str, n: int = 1) -> None:
+    with _STATS_LOCK:
+        _stats[key] += n
+
+
+def _avg_latency() -> int | None:
+    with _STATS_LOCK:
+        n = len(_stats["_latencies"])
+        return round(_stats["_lat_sum"] / n) if n else None
+
 
 _SKIP_PATHS = {"/favicon.ico", "/health", "/stats"}
 
+# ---------------------------------------------------------------------------
+# Shared HTTP session  (keep-alive pool to the AnyLog node)
+# ---------------------------------------------------------------------------
+# One Session for the whole process so consecutive calls reuse the same TCP
+# connection instead of paying a handshake per proxy call.  max_retries=0:
+# AnyLog commands are not guaranteed idempotent, so never silently resend.
+SESSION = requests.Session()
+SESSION.headers.update({
+    "User-Agent":   "AnyLog/1.23",
+    "Content-Type": "application/json",
+})
+
+
+# urllib3 already sets TCP_NODELAY by default; keep its defaults and add
+# SO_KEEPALIVE so idle pooled sockets to the node are not silently dropped
+# by NAT / firewalls between dashboard polls.
+_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+if hasattr(socket, "TCP_KEEPIDLE"):     # Linux; other platforms keep OS default
+    _SOCKET_OPTIONS.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60))
+
+
+class NoDelayAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled sockets get _SOCKET_OPTIONS."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = _SOCKET_OPTIONS
+        return super().init_poolmanager(*args, **kwargs)
+
+
+def _mount_pool(pool_size: int) -> None:
+    """
+    (Re)mount the http:// adapter with room for pool_size keep-alive sockets.
+
+    Every concurrent Flask handler thread holds one connection while it waits
+    on AnyLog; when more threads than pool_maxsize are in flight, urllib3
+    opens throw-away sockets and discards them afterwards, which is exactly
+    the handshake churn the shared Session is meant to avoid.
+
+    Called from _apply_env() once configuration is final; a repeat call with
+    the same size keeps the pool, and a replaced adapter is closed so its
+    sockets are not leaked.
+    """
+    old = SESSION.adapters.get("http://")
+    if isinstance(old, NoDelayAdapter) and old._pool_maxsize == pool_size:
+        return
+    SESSION.mount("http://", NoDelayAdapter(
+        pool_connections=32,
+        pool_maxsize=pool_size,
+        max_retries=0,
+    ))
+    if old is not None:
+        old.close()
+
 
 # ---------------------------------------------------------------------------
 # Core AnyLog HTTP helper
@@ -130,33 +298,113 @@ class AnyLogError(Exception):
 
 
 
+# Flat {...} object mentioning err_code/err_text — covers every payload AnyLog
+# actually sends; _extract_anylog_error() falls back to a full scan otherwise.
+_ERR_RE = re.compile(r'\{[^{}]{0,2048}?"err_(?:code|text)"[^{}]{0,2048}?\}')
+
+
 def _extract_anylog_error(exc_str: str) -> dict | None:
     """
     AnyLog sometimes embeds a JSON error payload inside the exception string
     raised by urllib3/requests when chunked transfer decoding fails.
 
-    We locate and parse the *first valid JSON object* found anywhere in the
-    exception text using JSONDecoder.raw_decode (more robust than regex when
-    the payload contains nested braces inside strings).
+    A precompiled regex locates the usual flat payload in one pass.  If that
+    misses (or the span is not valid JSON) we locate and parse the *first
+    valid JSON object* found anywhere in the exception text using
+    JSONDecoder.raw_decode (more robust than regex when the payload contains
+    nested braces inside strings).
     """
     if not exc_str:
         return None
+    m = _ERR_RE.search(exc_str)
+    if m:
+        try:
+            obj = json.loads(m.group())
+            if isinstance(obj, dict):
+                return obj
+        except ValueError:
+            pass
     dec = json.JSONDecoder()
     # Try every '{' as a potential start of a JSON object
-    for i, ch in enumerate(exc_str):
-        if ch != "{":
-            continue
+    i = exc_str.find("{")
+    while i != -1:
         try:
-            obj, _ = dec.raw_decode(exc_str[i:])
+            obj, _ = dec.raw_decode(exc_str, i)
             if isinstance(obj, dict) and ("err_code" in obj or "err_text" in obj):
                 return obj
         except Exception:
-            continue
+            pass
+        i = exc_str.find("{", i + 1)
     return None
 
 
+def _log_al(command: str) -> None:
+    # skip the slice entirely when INFO is off (e.g. a quieter WSGI deployment)
+    if log.isEnabledFor(logging.INFO):
+        log.info("[AL]  command: %s", command[:160])
+
+
+# Per-call header templates; User-Agent / Content-Type come from SESSION.headers
+_BASE_HEADERS     = {}
+_BASE_HEADERS_SQL = {"destination": "network"}
+
+
+def _anylog_headers(command: str, sql_query: bool) -> dict:
+    headers = (_BASE_HEADERS_SQL if sql_query else _BASE_HEADERS).copy()
+    headers["command"] = command
+    return headers
+
+
+def _record_latency(ms: int) -> None:
+    with _STATS_LOCK:
+        lats = _stats["_latencies"]
+        if len(lats) == lats.maxlen:
+            _stats["_lat_sum"] -= lats[0]     # about to be evicted by append()
+        lats.append(ms)
+        _stats["_lat_sum"] += ms
+
+
+def _anylog_error(exc: Exception, ms: int) -> "AnyLogError | None":
+    """
+    Map a transport exception to an AnyLogError, or None if it is not one.
+
+    AnyLog sends its JSON error payload where the HTTP chunk-length byte
+    should be.  This corrupts HTTP framing and surfaces as one of several
+    exception types depending on the requests/urllib3 version and whether
+    stream=False managed to buffer before the error hit.  Catch all and
+    check whether it looks like a chunked-encoding / AnyLog protocol error.
+    """
+    raw = str(exc)
+
+    is_chunked = (
+        isinstance(exc, (
+            requests.exceptions.ChunkedEncodingError,
+            urllib3.exceptions.ProtocolError,
+            urllib3.exceptions.InvalidChunkLength,
+        ))
+        # fallback: match by string for wrapped/nested exception types
+        or "InvalidChunkLength" in raw
+        or "ProtocolError" in raw
+        or "ChunkedEncodingError" in raw
+        or "err_code" in raw        # AnyLog JSON payload present
+    )
+    if not is_chunked:
+        return None
+
+    log.warning("[AL]  %d ms | chunked-encoding / AnyLog protocol error", ms)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("[AL]  raw exception: %s", raw[:400])
+    info = _extract_anylog_error(raw)
+    if info:
+        code = info.get("err_code", -1)
+        text = info.get("err_text", "Unknown")
+        log.warning("[AL]  AnyLog error %d: %s", code, text)
+        return AnyLogError(code, text, raw)
+    # Chunked error but no JSON payload — generic AnyLogError
+    return AnyLogError(-1, "Malformed chunked response", raw)
+
 
-def anylog_get(command: str, sql_query: bool = False) -> str:
+def anylog_get(command: str, sql_query: bool = False, timeout: float | None = None) -> bytes:
     """
     One AnyLog REST call, exactly as README_REST.md specifies:
 
@@ -181,83 +429,153 @@ def anylog_get(command: str, sql_query: bool = False) -> str:
       payload is embedded in the exception message itself.  We extract it,
       parse it, and raise a clean AnyLogError so callers can handle it
       properly instead of crashing with an unhandled ProtocolError.
+
+    * SESSION  — All calls go through the module-level pooled Session, so the
+      socket to the AnyLog node is kept alive between dashboard polls.
     """
-    url = f"http://{CFG['anylog_ip']}:{CFG['anylog_port']}"
-    headers = {
-        "User-Agent":   "AnyLog/1.23",
-        "Content-Type": "application/json",
-        "command":      command,
-    }
-    if sql_query:
-        headers["destination"] = "network"
-
-    log.info("[AL]  command: %s", command[:160])
-    _stats["anylog_calls"] += 1
+    url     = CFG["_url"]
+    headers = _anylog_headers(command, sql_query)
+
+    _log_al(command)
+    _bump("anylog_calls")
 
     t0 = time.perf_counter()
     try:
-        resp = requests.get(
+        resp = SESSION.get(
             url,
             headers=headers,
-            timeout=CFG["timeout"],
+            timeout=CFG["timeout"] if timeout is None else timeout,
             stream=False,          # ← read full body; avoids chunked-parse crash
         )
         ms = round((time.perf_counter() - t0) * 1000)
-        _stats["_latencies"].append(ms)
-        if len(_stats["_latencies"]) > 50:
-            _stats["_latencies"].pop(0)
+        _record_latency(ms)
 
-        log.info("[AL]  %d ms | HTTP %d | %d bytes", ms, resp.status_code, len(resp.text))
+        body = resp.content        # raw bytes — decoded only where text is needed
+        log.info("[AL]  %d ms | HTTP %d | %d bytes", ms, resp.status_code, len(body))
         resp.raise_for_status()
-        return resp.text
+        return body
 
     except Exception as exc:
-        # AnyLog sends its JSON error payload where the HTTP chunk-length byte
-        # should be.  This corrupts HTTP framing and surfaces as one of several
-        # exception types depending on the requests/urllib3 version and whether
-        # stream=False managed to buffer before the error hit.  Catch all and
-        # check whether it looks like a chunked-encoding / AnyLog protocol error.
-        ms  = round((time.perf_counter() - t0) * 1000)
-        raw = str(exc)
-
-        is_chunked = (
-            isinstance(exc, (
-                requests.exceptions.ChunkedEncodingError,
-                urllib3.exceptions.ProtocolError,
-                urllib3.exceptions.InvalidChunkLength,
-            ))
-            # fallback: match by string for wrapped/nested exception types
-            or "InvalidChunkLength" in raw
-            or "ProtocolError" in raw
-            or "ChunkedEncodingError" in raw
-            or "err_code" in raw        # AnyLog JSON payload present
-        )
+        err = _anylog_error(exc, round((time.perf_counter() - t0) * 1000))
+        if err is not None:
+            raise err from exc
+        # Not a chunked error — re-raise as-is (ConnectionError, Timeout, etc.)
+        raise
 
-        if is_chunked:
-            log.warning("[AL]  %d ms | chunked-encoding / AnyLog protocol error", ms)
-            log.debug("[AL]  raw exception: %s", raw[:400])
-            info = _extract_anylog_error(raw)
-            if info:
-                code = info.get("err_code", -1)
-                text = info.get("err_text", "Unknown")
-                log.warning("[AL]  AnyLog error %d: %s", code, text)
-                raise AnyLogError(code, text, raw) from exc
-            # Chunked error but no JSON payload — raise generic AnyLogError
-            raise AnyLogError(-1, "Malformed chunked response", raw) from exc
 
-        # Not a chunked error — re-raise as-is (ConnectionError, Timeout, etc.)
+_STREAM_CHUNK = 65536
+
+
+def anylog_get_stream(command: str, sql_query: bool = True):
+    """
+    Streaming variant of anylog_get() for potentially large SQL results.
+
+    Returns (resp, head, rest):
+        head — bytes already read (at most two _STREAM_CHUNK chunks)
+        rest — iterator over the remaining body chunks, or None when the
+               whole body fit in head (resp is then fully consumed)
+
+    The first reads happen inside the same error handling as anylog_get():
+    AnyLog's malformed-chunk error payload arrives in place of the first
+    chunk, so it is still raised as AnyLogError before anything is relayed
+    to the dashboard.  If those reads fail, resp is closed before the error
+    propagates; otherwise the caller must close it once rest is drained.
+    """
+    url     = CFG["_url"]
+    headers = _anylog_headers(command, sql_query)
+
+    _log_al(command)
+    _bump("anylog_calls")
+
+    t0 = time.perf_counter()
+    resp = None
+    try:
+        resp = SESSION.get(url, headers=headers, timeout=CFG["timeout"], stream=True)
+        resp.raise_for_status()
+        chunks = resp.iter_content(_STREAM_CHUNK)
+        head   = next(chunks, b"")
+        more   = next(chunks, None)
+        ms = round((time.perf_counter() - t0) * 1000)
+        _record_latency(ms)
+    except Exception as exc:
+        err = _anylog_error(exc, round((time.perf_counter() - t0) * 1000))
+        if resp is not None:
+            if isinstance(exc, requests.exceptions.HTTPError):
+                try:
+                    resp.content        # buffer it: handlers quote exc.response.text
+                except Exception:
+                    pass
+            resp.close()                # hand the pooled connection back now
+        if err is not None:
+            raise err from exc
         raise
 
+    if more is None:
+        log.info("[AL]  %d ms | HTTP %d | %d bytes", ms, resp.status_code, len(head))
+        return resp, head, None
+    log.info("[AL]  %d ms | HTTP %d | streaming (%d+ bytes)",
+             ms, resp.status_code, len(head) + len(more))
+    return resp, head + more, chunks
+
 
-def _parse_rows(raw: str) -> list:
+def _drain(resp, head: bytes, rest) -> bytes:
+    """
+    Read the remainder of an anylog_get_stream() body into one bytes object.
+
+    The reads get the same error mapping as anylog_get(): a malformed chunk
+    becomes AnyLogError, and a read timeout (which requests re-raises from
+    iter_content() as ConnectionError) is surfaced as Timeout again.  resp is
+    closed whatever happens.
+    """
+    t0 = time.perf_counter()
+    try:
+        return head if rest is None else head + b"".join(rest)
+    except Exception as exc:
+        err = _anylog_error(exc, round((time.perf_counter() - t0) * 1000))
+        if err is not None:
+            raise err from exc
+        if (isinstance(exc, requests.exceptions.ConnectionError) and exc.args
+                and isinstance(exc.args[0], urllib3.exceptions.ReadTimeoutError)):
+            raise requests.exceptions.ReadTimeout(str(exc)) from exc
+        raise
+    finally:
+        resp.close()
+
+
+# ---------------------------------------------------------------------------
+# JSON codec  (orjson when installed, stdlib json otherwise)
+# ---------------------------------------------------------------------------
+if orjson is not None:
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps                       # → bytes
+else:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _ojson(obj, status: int = 200):
+    """jsonify() replacement for row payloads — encodes through _json_dumps."""
+    return app.response_class(_json_dumps(obj), status=status, mimetype="application/json")
+
+
+def _text(raw: bytes | str) -> str:
+    """AnyLog response body as text (anylog_get returns bytes)."""
+    return raw.decode("utf-8", errors="replace") if isinstance(raw, bytes) else raw
+
+
+def _parse_rows(raw: bytes | str) -> list:
     """Coerce any AnyLog response shape into a list of row-dicts."""
-    raw = (raw or "").strip()
-    if not raw or raw in ("[]", "null", "{}"):
+    raw = (raw or b"").strip()
+    if raw[:1] not in (b"[", b"{", "[", "{"):
+        return []                         # empty or non-JSON text ('get status', ...)
+    if raw in (b"[]", b"{}", "[]", "{}"):
         return []
     try:
-        data = json.loads(raw)
-    except json.JSONDecodeError as exc:
-        log.warning("JSON parse error: %s  raw=%s", exc, raw[:200])
+        data = _json_loads(raw)           # both codecs accept bytes directly
+    except json.JSONDecodeError as exc:   # orjson.JSONDecodeError subclasses it
+        log.warning("JSON parse error: %s  raw=%s", exc, _text(raw[:200]))
         return []
     if isinstance(data, list):
         return data
@@ -269,24 +587,162 @@ def _parse_rows(raw: str) -> list:
     return []
 
 
-def run_sql(dbms: str, sql: str) -> list:
+# ---------------------------------------------------------------------------
+# Request coalescing  (one AnyLog call per identical in-flight command)
+# ---------------------------------------------------------------------------
+_INFLIGHT: dict[tuple, Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+def _singleflight(key: tuple, fn, timeout: float | None = None):
+    """
+    Run fn() once for all concurrent callers sharing key.
+
+    The first caller runs fn(); callers arriving while it is in flight wait
+    on its Future and receive the same result or exception.  Panels that
+    open together and issue the same query collapse into a single call.
+    """
+    with _INFLIGHT_LOCK:
+        fut    = _INFLIGHT.get(key)
+        leader = fut is None
+        if leader:
+            fut = _INFLIGHT[key] = Future()
+
+    if not leader:
+        wait = CFG["timeout"] if timeout is None else timeout
+        try:
+            return fut.result(timeout=wait)
+        except FutureTimeout:
+            raise requests.exceptions.Timeout(f"coalesced call still running after {wait}s") from None
+
+    try:
+        result = fn()
+    except BaseException as exc:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+        fut.set_exception(exc)
+        raise
+    with _INFLIGHT_LOCK:
+        _INFLIGHT.pop(key, None)     # later callers start a fresh call
+    fut.set_result(result)
+    return result
+
+
+def run_sql(dbms: str, sql: str, timeout: float | None = None) -> list:
     """Distributed SQL query → list of row dicts."""
-    raw  = anylog_get(f"sql {dbms} {sql}", sql_query=True)
-    rows = _parse_rows(raw)
-    _stats["total_rows"] += len(rows)
+    command = f"sql {dbms} {sql}"
+    rows = _singleflight(
+        (command, True),
+        lambda: _parse_rows(anylog_get(command, sql_query=True, timeout=timeout)),
+        timeout,
+    )
+    _bump("total_rows", len(rows))
     return rows
 
 
-def run_command(command: str) -> str:
-    """Non-SQL AnyLog command → raw response text."""
-    return anylog_get(command, sql_query=False)
+def _query_fetch(command: str):
+    """
+    anylog_get_stream() for /api/query, coalesced like run_sql().
+
+    Returns the same (resp, head, rest) triple.  A buffered answer is read
+    to the end inside _singleflight(), so identical concurrent queries share
+    one AnyLog call and get (None, body, None).  A large bare JSON array is
+    left streaming for the caller that opened it; a live stream cannot be
+    shared, so callers that were waiting on it issue their own call.
+    """
+    opened = []
+
+    def fetch():
+        resp, head, rest = anylog_get_stream(command, sql_query=True)
+        if rest is not None and head.lstrip()[:1] == b"[":
+            opened.append((resp, head, rest))
+            return None
+        return _drain(resp, head, rest)
+
+    body = _singleflight(("sql", command), fetch)
+    if opened:
+        return opened[0]
+    if body is None:
+        return anylog_get_stream(command, sql_query=True)
+    return None, body, None
+
+
+def run_command(command: str, timeout: float | None = None) -> bytes:
+    """Non-SQL AnyLog command → raw response body (see _text())."""
+    return _singleflight(
+        (command, False),
+        lambda: anylog_get(command, sql_query=False, timeout=timeout),
+        timeout,
+    )
+
+
+def _relay(resp, head: bytes, rest, gzip: bool = False):
+    """
+    Generator body for a streamed /api/query response.
+
+    With gzip=True each chunk goes through one zlib stream (gzip framing) as
+    it arrives.  Rows are not parsed on this path, so streamed results are
+    not counted in total_rows.  A transport error after the first chunk can
+    no longer become an HTTP error status; it is logged and the body ends
+    early.
+    """
+    z = zlib.compressobj(4, zlib.DEFLATED, 31) if gzip else None
+    try:
+        for chunk in itertools.chain((head,), rest):
+            if z is None:
+                yield chunk
+            else:
+                out = z.compress(chunk)
+                if out:
+                    yield out
+    except Exception as exc:
+        log.warning("[AL]  stream aborted after partial body: %s", str(exc)[:200])
+    finally:
+        resp.close()
+    if z is not None:
+        yield z.flush()
+
+
+# ---------------------------------------------------------------------------
+# Metadata TTL cache
+# ---------------------------------------------------------------------------
+# Databases, tables, columns, cluster info, data nodes and UNS policies change
+# on the order of minutes while dashboards poll them every few seconds.
+# Responses are cached per command string for CFG["cache_ttl"] seconds.
+_META_CACHE_MAX = 256
+_meta_cache: dict = {}          # command → (monotonic timestamp, raw), oldest first
+_meta_cache_lock = threading.Lock()
+
+
+def run_command_cached(command: str, ttl: float | None = None) -> bytes:
+    """run_command() served from the metadata cache when fresh."""
+    ttl = CFG["cache_ttl"] if ttl is None else ttl
+    if ttl <= 0:
+        return run_command(command)
+
+    now = time.monotonic()
+    with _meta_cache_lock:
+        entry = _meta_cache.get(command)
+    if entry is not None and now - entry[0] < ttl:
+        _bump("cache_hits")
+        return entry[1]
+
+    _bump("cache_misses")
+    raw = run_command(command)
+    with _meta_cache_lock:
+        # Re-inserting an existing key keeps its old slot, so drop it first:
+        # dicts keep insertion order → first key is the oldest entry.
+        if _meta_cache.pop(command, None) is None and len(_meta_cache) >= _META_CACHE_MAX:
+            _meta_cache.pop(next(iter(_meta_cache)))
+        _meta_cache[command] = (time.monotonic(), raw)
+    return raw
 
 
 # ---------------------------------------------------------------------------
 # Error helper
 # ---------------------------------------------------------------------------
 def _err(msg: str, details: str = "", status: int = 500):
-    _stats["errors"] += 1
+    _bump("errors")
     body = {"error": msg}
     if details:
         body["details"] = details
@@ -299,7 +755,7 @@ def _err(msg: str, details: str = "", status: int = 500):
 @app.before_request
 def _count():
     if request.method != "OPTIONS" and request.path not in _SKIP_PATHS:
-        _stats["proxy_calls"] += 1
+        _bump("proxy_calls")
 
 
 # ===========================================================================
@@ -309,13 +765,12 @@ def _count():
 def health():
     conn, node_raw = "ok", ""
     try:
-        node_raw = run_command("get status").strip()[:200]
+        node_raw = _text(run_command("get status").strip()[:200])
     except Exception as exc:
         conn     = "error"
         node_raw = str(exc)[:200]
 
-    lats   = _stats["_latencies"]
-    avg_ms = round(sum(lats) / len(lats)) if lats else None
+    avg_ms = _avg_latency()
 
     return jsonify({
         "status":          "healthy",
@@ -339,13 +794,14 @@ def health():
 
 @app.route("/stats", methods=["GET"])
 def stats_ep():
-    lats = _stats["_latencies"]
     return jsonify({
         "proxy_calls":    _stats["proxy_calls"],
         "anylog_calls":   _stats["anylog_calls"],
         "total_rows":     _stats["total_rows"],
         "errors":         _stats["errors"],
-        "avg_latency_ms": round(sum(lats) / len(lats)) if lats else None,
+        "cache_hits":     _stats["cache_hits"],
+        "cache_misses":   _stats["cache_misses"],
+        "avg_latency_ms": _avg_latency(),
         "uptime_sec":     round(time.time() - _stats["start_time"]),
     })
 
@@ -360,7 +816,7 @@ def connection_status():
         return jsonify({
             "status":   "established",
             "node":     f"{CFG['anylog_ip']}:{CFG['anylog_port']}",
-            "response": raw.strip()[:200],
+            "response": _text(raw.strip()[:200]),
         })
     except Exception as exc:
         return _err("Connection failed", str(exc), 503)
@@ -372,7 +828,7 @@ def connection_test():
         return "", 204
     try:
         raw = run_command("get status")
-        return jsonify({"success": True, "response": raw.strip()[:200]})
+        return jsonify({"success": True, "response": _text(raw.strip()[:200])})
     except Exception as exc:
         return _err("Connection test failed", str(exc), 503)
 
@@ -380,11 +836,18 @@ def connection_test():
 # ===========================================================================
 # Metadata discovery
 # ===========================================================================
+def _with_raw(body: dict, raw: bytes) -> dict:
+    """Attach AnyLog's raw response text only when the caller asks (?debug=1)."""
+    if request.args.get("debug", "") not in ("", "0", "false"):
+        body["raw"] = _text(raw)
+    return body
+
+
 @app.route("/api/databases", methods=["GET"])
 def list_databases():
     try:
-        raw = run_command("get databases")
-        return jsonify({"databases": _parse_rows(raw), "raw": raw})
+        raw = run_command_cached("get databases")
+        return _ojson(_with_raw({"databases": _parse_rows(raw)}, raw))
     except Exception as exc:
         return _err("Failed to list databases", str(exc))
 
@@ -392,8 +855,8 @@ def list_databases():
 @app.route("/api/databases/<dbms>/tables", methods=["GET"])
 def list_tables(dbms):
     try:
-        raw = run_command(f"get tables where dbms = {dbms}")
-        return jsonify({"dbms": dbms, "tables": _parse_rows(raw), "raw": raw})
+        raw = run_command_cached(f"get tables where dbms = {dbms}")
+        return _ojson(_with_raw({"dbms": dbms, "tables": _parse_rows(raw)}, raw))
     except Exception as exc:
         return _err(f"Failed to list tables for {dbms}", str(exc))
 
@@ -401,8 +864,8 @@ def list_tables(dbms):
 @app.route("/api/databases/<dbms>/tables/<table>/columns", methods=["GET"])
 def list_columns(dbms, table):
     try:
-        raw = run_command(f"get columns where dbms = {dbms} and table = {table} and format = json")
-        return jsonify({"dbms": dbms, "table": table, "columns": _parse_rows(raw)})
+        raw = run_command_cached(f"get columns where dbms = {dbms} and table = {table} and format = json")
+        return _ojson({"dbms": dbms, "table": table, "columns": _parse_rows(raw)})
     except Exception as exc:
         return _err(f"Failed to list columns for {dbms}.{table}", str(exc))
 
@@ -413,8 +876,8 @@ def list_columns(dbms, table):
 @app.route("/api/nodes", methods=["GET"])
 def list_nodes():
     try:
-        raw = run_command("get cluster info")
-        return jsonify({"nodes": _parse_rows(raw), "raw": raw})
+        raw = run_command_cached("get cluster info")
+        return _ojson(_with_raw({"nodes": _parse_rows(raw)}, raw))
     except Exception as exc:
         return _err("Failed to get cluster info", str(exc))
 
@@ -432,23 +895,31 @@ def node_status():
     cmd = f"get status where node = {node}" if node else "get status"
     try:
         raw = run_command(cmd)
-        return jsonify({"node": node or "local", "status": raw.strip()})
+        return jsonify({"node": node or "local", "status": _text(raw.strip())})
     except Exception as exc:
         return _err("Failed to get node status", str(exc))
 
 
+def _lower(value) -> str:
+    return value.lower() if type(value) is str else str(value).lower()
+
+
 @app.route("/api/data/location", methods=["GET"])
 def data_location():
     dbms  = request.args.get("dbms",  "")
     table = request.args.get("table", "")
     try:
-        raw  = run_command("get data nodes")
+        raw  = run_command_cached("get data nodes")
         rows = _parse_rows(raw)
-        if dbms:
-            rows = [r for r in rows if str(r.get("dbms", "")).lower() == dbms.lower()]
-        if table:
-            rows = [r for r in rows if str(r.get("table", "")).lower() == table.lower()]
-        return jsonify({"dbms": dbms, "table": table, "locations": rows})
+        if dbms or table:
+            # one pass, filter values lowered once; AnyLog fields are normally str
+            dbms_l, table_l = dbms.lower(), table.lower()
+            rows = [
+                r for r in rows
+                if (not dbms_l or _lower(r.get("dbms", "")) == dbms_l)
+                and (not table_l or _lower(r.get("table", "")) == table_l)
+            ]
+        return _ojson({"dbms": dbms, "table": table, "locations": rows})
     except Exception as exc:
         return _err("Failed to get data location", str(exc))
 
@@ -468,11 +939,26 @@ def api_query():
     if not dbms or not sql:
         return _err("Request body must include 'dbms' and 'sql'", status=400)
 
-    log.info("[PROXY] /api/query  dbms=%s | sql=%s", dbms, sql[:150])
+    if log.isEnabledFor(logging.INFO):
+        log.info("[PROXY] /api/query  dbms=%s | sql=%s", dbms, sql[:150])
 
     try:
-        rows = run_sql(dbms, sql)
-        return jsonify(rows)
+        resp, head, rest = _query_fetch(f"sql {dbms} {sql}")
+        if rest is not None and head.lstrip()[:1] == b"[":
+            # Large bare JSON array — already the shape the dashboard expects,
+            # so relay AnyLog's bytes instead of parsing and re-encoding them.
+            gz = "gzip" in request.headers.get("Accept-Encoding", "")
+            out = app.response_class(
+                stream_with_context(_relay(resp, head, rest, gzip=gz)),
+                mimetype="application/json",
+            )
+            out.headers["Vary"] = "Accept-Encoding"
+            if gz:
+                out.headers["Content-Encoding"] = "gzip"
+            return out
+        rows = _parse_rows(head if resp is None else _drain(resp, head, rest))
+        _bump("total_rows", len(rows))
+        return _ojson(rows)
     except AnyLogError as exc:
         # AnyLog returned a structured error (timeout, SQL failure, etc.)
         # delivered via malformed chunked response — already extracted cleanly
@@ -498,6 +984,20 @@ def api_query():
 # ===========================================================================
 # Time-series increment query
 # ===========================================================================
+_SQL_INC = (
+    "SELECT increments({unit}, {interval}, {tc}), {proj} FROM {table} "
+    "WHERE {tc} >= '{start}' AND {tc} <= '{end}' ORDER BY {tc}"
+)
+_UNITS    = frozenset({"second", "minute", "hour", "day", "week", "month", "year"})
+_IDENT_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+# column, func(column) or func(*), with an optional "as alias"
+_PROJ_RE  = re.compile(
+    r"\s*(?:[A-Za-z_]\w*\s*\(\s*(?:\*|[A-Za-z_][\w.]*)\s*\)|[A-Za-z_][\w.]*)"
+    r"(?:\s+as\s+[A-Za-z_]\w*)?\s*",
+    re.IGNORECASE,
+)
+
+
 @app.route("/api/query/increment", methods=["POST", "OPTIONS"])
 def api_query_increment():
     if request.method == "OPTIONS":
@@ -510,26 +1010,41 @@ def api_query_increment():
     start       = (body.get("startTime")     or "NOW() - 1 day").strip()
     end         = (body.get("endTime")       or "NOW()").strip()
     unit        = (body.get("timeUnit")      or "hour").strip()
-    interval    = int(body.get("intervalLength", 1))
+    interval    = body.get("intervalLength", 1)
     projections = body.get("projections", ["avg(rest)"])
 
     if not dbms or not table:
         return _err("Missing 'dbms' or 'table'", status=400)
 
-    proj_str = ", ".join(projections)
-    sql = (
-        f"SELECT increments({unit}, {interval}, {time_col}), "
-        f"{proj_str} "
-        f"FROM {table} "
-        f"WHERE {time_col} >= '{start}' AND {time_col} <= '{end}' "
-        f"ORDER BY {time_col}"
-    )
+    # Every value below is pasted into AnyLog SQL — validate, don't escape.
+    for name, value in (("dbms", dbms), ("table", table), ("timeColumn", time_col)):
+        if not _IDENT_RE.fullmatch(value):
+            return _err(f"Invalid {name!r}: {value!r}", status=400)
+    if unit not in _UNITS:
+        return _err(f"Invalid 'timeUnit': {unit!r} (one of {', '.join(sorted(_UNITS))})", status=400)
+    try:
+        interval = int(interval)
+    except (TypeError, ValueError):
+        interval = 0
+    if interval < 1:
+        return _err("'intervalLength' must be a positive integer", status=400)
+    if any(c in start or c in end for c in "';\\"):
+        return _err("'startTime' / 'endTime' must not contain quotes, ';' or '\\'", status=400)
+    if (not isinstance(projections, list) or not projections
+            or not all(isinstance(p, str) and _PROJ_RE.fullmatch(p) for p in projections)):
+        return _err("'projections' must be a list like [\"avg(col)\", \"max(col) as m\"]", status=400)
+
+    sql = _SQL_INC.format_map({
+        "unit": unit, "interval": interval, "tc": time_col, "table": table,
+        "proj": ", ".join(projections), "start": start, "end": end,
+    })
 
-    log.info("[PROXY] /api/query/increment  dbms=%s | sql=%s", dbms, sql[:160])
+    if log.isEnabledFor(logging.INFO):
+        log.info("[PROXY] /api/query/increment  dbms=%s | sql=%s", dbms, sql[:160])
 
     try:
         rows = run_sql(dbms, sql)
-        return jsonify(rows)
+        return _ojson(rows)
     except AnyLogError as exc:
         log.warning("[PROXY] AnyLog error %d: %s", exc.err_code, exc.err_text)
         return _err(f"AnyLog error {exc.err_code}: {exc.err_text}", exc.raw[:300], 502)
@@ -557,21 +1072,34 @@ def api_command():
     if not command:
         return _err("Request body must include 'command'", status=400)
 
-    timeout_override = body.get("timeout")
-    orig_timeout = CFG["timeout"]
-    if timeout_override:
-        CFG["timeout"] = float(timeout_override)
+    # Per-request override, passed down the call — never written to CFG,
+    # which is shared by every handler thread.
+    timeout = body.get("timeout")
+    if timeout in (None, ""):
+        timeout = None
+    else:
+        try:
+            timeout = float(timeout)
+        except (TypeError, ValueError):
+            timeout = math.nan
+        if not math.isfinite(timeout) or timeout <= 0:
+            return _err("'timeout' must be a positive number of seconds", status=400)
+    parse = body.get("parse", True)
+    if not isinstance(parse, bool):
+        return _err("'parse' must be true or false", status=400)
 
     try:
-        raw  = run_command(command)
+        # Not run_command(): arbitrary commands may have side effects, so
+        # identical concurrent requests must each reach the node.
+        raw  = anylog_get(command, sql_query=False, timeout=timeout)
+        if not parse:
+            return _ojson({"command": command, "raw": _text(raw)})
         rows = _parse_rows(raw)
-        return jsonify({"command": command, "raw": raw, "rows": rows})
+        return _ojson({"command": command, "raw": _text(raw), "rows": rows})
     except AnyLogError as exc:
         return _err(f"AnyLog error {exc.err_code}: {exc.err_text}", exc.raw[:300], 502)
     except Exception as exc:
         return _err(str(exc))
-    finally:
-        CFG["timeout"] = orig_timeout
 
 
 
@@ -583,9 +1111,9 @@ def uns_root_policies():
     """Return UNS root policies via AnyLog blockchain."""
     cmd = "blockchain get uns"
     try:
-        raw = run_command(cmd)
+        raw = run_command_cached(cmd)
         policies = _parse_rows(raw)
-        return jsonify({"command": cmd, "policies": policies, "raw": raw})
+        return _ojson(_with_raw({"command": cmd, "policies": policies}, raw))
     except AnyLogError as exc:
         log.warning("[PROXY] AnyLog error %d: %s", exc.err_code, exc.err_text)
         return _err(f"AnyLog error {exc.err_code}: {exc.err_text}", exc.raw[:300], 502)
@@ -593,6 +1121,32 @@ def uns_root_policies():
         return _err("Failed to get UNS root policies", str(exc))
 
 
+# ===========================================================================
+# Configuration / WSGI entry
+# ===========================================================================
+_ENV_VARS = (
+    ("anylog_ip",   "ANYLOG_IP",   str),
+    ("anylog_port", "ANYLOG_PORT", int),
+    ("timeout",     "TIMEOUT",     float),
+    ("pool_size",   "POOL_SIZE",   int),
+    ("cache_ttl",   "CACHE_TTL",   float),
+)
+
+
+def _apply_env() -> None:
+    """Env-var overrides (as documented in README_REST.md) → CFG."""
+    for key, var, conv in _ENV_VARS:
+        if var in os.environ:
+            CFG[key] = conv(os.environ[var])
+    _set_node_url()
+    _mount_pool(CFG["pool_size"])
+
+
+# gunicorn imports `app` without running main(), so pick up the environment
+# here; main() applies its CLI arguments and then the environment again.
+_apply_env()
+
+
 # ===========================================================================
 # Entry point
 # ===========================================================================
@@ -603,13 +1157,17 @@ def main():
     parser.add_argument("--anylog-ip",   default="172.79.89.206", help="AnyLog node IP")
     parser.add_argument("--anylog-port", type=int, default=32049, help="AnyLog node REST port")
     parser.add_argument("--timeout",     type=float, default=60.0,help="Request timeout in seconds (default: 60)")
+    parser.add_argument("--pool-size",   type=int, default=64,    help="Max keep-alive connections to AnyLog (default: 64)")
+    parser.add_argument("--cache-ttl",   type=float, default=30.0,help="Metadata cache TTL in seconds, 0 disables (default: 30)")
     parser.add_argument("--debug",       action="store_true",     help="Enable Flask debug mode")
     args = parser.parse_args()
 
-    # Env-var overrides (as documented in README_REST.md)
-    CFG["anylog_ip"]   = os.environ.get("ANYLOG_IP",   args.anylog_ip)
-    CFG["anylog_port"] = int(os.environ.get("ANYLOG_PORT", args.anylog_port))
-    CFG["timeout"]     = float(os.environ.get("TIMEOUT",   args.timeout))
+    CFG["anylog_ip"]   = args.anylog_ip
+    CFG["anylog_port"] = args.anylog_port
+    CFG["timeout"]     = args.timeout
+    CFG["pool_size"]   = args.pool_size
+    CFG["cache_ttl"]   = args.cache_ttl
+    _apply_env()
 
     proxy_host = os.environ.get("PROXY_HOST", args.host)
     proxy_port = int(os.environ.get("PROXY_PORT", args.port))
@@ -620,6 +1178,8 @@ def main():
     log.info("  AnyLog node:  http://%s:%d  (HTTP, not HTTPS)", CFG["anylog_ip"], CFG["anylog_port"])
     log.info("  User-Agent :  AnyLog/1.23")
     log.info("  Timeout    :  %.0f s", CFG["timeout"])
+    log.info("  Pool size  :  %d keep-alive connections", CFG["pool_size"])
+    log.info("  Meta cache :  %.0f s TTL", CFG["cache_ttl"])
     log.info("")
     log.info("  Set Dashboard 'Proxy URL' to:")
     log.info("    http://localhost:%d", proxy_port)
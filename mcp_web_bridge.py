@@ -17,32 +17,86 @@ ARCHITECTURE (unchanged from v3)
 ---------------------------------
 ONE subprocess (mcp-proxy), ONE worker thread, ONE MCP connection.
 HTTP endpoints NEVER call MCP directly — they post a Job to the worker queue
-and block on a threading.Event until the worker completes it.
-The worker executes jobs one at a time with CALL_DELAY_S between them.
+and block on a shared threading.Condition until the job completes.
+The worker writes requests; a reader thread matches responses back by
+JSON-RPC id.  By default one call is outstanding at a time (--max-inflight
+raises that); a token bucket allows CALL_BURST calls back-to-back, then
+spaces them CALL_DELAY_S apart.
 
 CACHE
 -----
-Results stored in a TTL cache keyed by (tool, canonical-params).
+Results stored in a TTL cache keyed by tool + hash of canonical params.
 Metadata cached for CACHE_TTL_S; sensor/query data for DATA_TTL_S.
 """
 
+import abc
 import argparse
+import atexit
+import hashlib
 import json
 import logging
+import logging.handlers
 import os
 import queue
+import re
+import selectors
 import ssl
 import subprocess
 import sys
 import threading
 import time
 import uuid
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
-
-from flask import Flask, jsonify, request
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urljoin
+
+from flask import Flask, Response, g, jsonify, request, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 
+try:
+    import orjson      # optional C JSON codec: pip install orjson
+except ImportError:
+    orjson = None
+
+try:
+    import httpx       # optional: --transport sse/http talk to the MCP server directly
+except ImportError:
+    httpx = None
+
+# JSON-RPC codec for the mcp-proxy pipes: bytes out, bytes (or str) in.
+if orjson is not None:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+else:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    _loads = json.loads
+
+
+def _canon(params: Any) -> bytes:
+    """Canonical (sorted-key, compact) JSON encoding of a params dict (or any value)."""
+    if orjson is not None:
+        return orjson.dumps(params, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(params, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def _ck(tool: str, params: Dict[str, Any], canon: Optional[bytes] = None) -> str:
+    """
+    Cache / dedup key: "<tool>:<128-bit blake2b of canonical params>".
+
+    Fixed-size regardless of SQL length, and the tool prefix keeps
+    /api/worker/status readable.  Pass *canon* when _canon(params) is
+    already at hand.
+    """
+    if canon is None:
+        canon = _canon(params)
+    return tool + ":" + hashlib.blake2b(canon, digest_size=16).hexdigest()
+
 # ---------------------------------------------------------------------------
 # Defaults (all overridable via CLI)
 # ---------------------------------------------------------------------------
@@ -50,12 +104,19 @@ DEFAULT_MCP_PROXY_PATH = "/Users/mdavidson58/Documents/AnyLog/Prove-IT/venv/bin/
 DEFAULT_MCP_SERVER_URL = "https://172.79.89.206:32049/mcp/sse"
 DEFAULT_PORT           = 8080
 DEFAULT_HOST           = "0.0.0.0"
+DEFAULT_HTTP_THREADS   = 32   # gunicorn gthread handler threads (each may wait up to JOB_TIMEOUT_S)
 
 DEFAULT_CALL_DELAY_S = 1.5
-CALL_DELAY_S  = DEFAULT_CALL_DELAY_S  # pause between MCP calls (be gentle on the SSE server)
+DEFAULT_CALL_BURST   = 3
+DEFAULT_MAX_INFLIGHT = 1
+CALL_DELAY_S  = DEFAULT_CALL_DELAY_S  # sustained spacing between MCP calls (be gentle on the SSE server)
+CALL_BURST    = DEFAULT_CALL_BURST    # calls allowed back-to-back after an idle period
+MAX_INFLIGHT  = DEFAULT_MAX_INFLIGHT  # tools/call requests awaiting a response at once
+RPC_TIMEOUT_S = 45    # max seconds to wait for mcp-proxy to answer one request
 JOB_TIMEOUT_S = 60    # max seconds an HTTP request waits for the worker
 CACHE_TTL_S   = 300   # 5 min — metadata (tables, UNS, status)
 DATA_TTL_S    = 30    # 30 s  — query results
+STATUS_TTL_S  = 30    # 30 s  — /api/status (kept warm by the refresher)
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -67,6 +128,11 @@ LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
 logging.basicConfig(level=logging.INFO, format=LOG_FORMAT, stream=sys.stderr)
 log = logging.getLogger("mcp_bridge")
 
+# Once configured, handlers write on a QueueListener thread and the worker /
+# request threads only enqueue records — no stderr syscall on the MCP path.
+_log_queue = queue.SimpleQueue()
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
 
 def _configure_logging(quiet: bool, log_file: Optional[str], debug: bool) -> None:
     """
@@ -76,6 +142,7 @@ def _configure_logging(quiet: bool, log_file: Optional[str], debug: bool) -> Non
     debug=True  → DEBUG level    (overrides quiet)
     log_file    → also write to the given file path (appends, UTF-8)
     """
+    global _log_listener
     level = logging.DEBUG if debug else (logging.WARNING if quiet else logging.INFO)
 
     root = logging.getLogger()
@@ -83,21 +150,35 @@ def _configure_logging(quiet: bool, log_file: Optional[str], debug: bool) -> Non
 
     formatter = logging.Formatter(LOG_FORMAT)
 
-    # Replace any existing handlers on the root logger
-    root.handlers.clear()
-
     stderr_handler = logging.StreamHandler(sys.stderr)
     stderr_handler.setFormatter(formatter)
-    root.addHandler(stderr_handler)
+    sinks: List[logging.Handler] = [stderr_handler]
 
+    file_error = None
     if log_file:
         try:
             file_handler = logging.FileHandler(log_file, encoding="utf-8")
             file_handler.setFormatter(formatter)
-            root.addHandler(file_handler)
-            log.info("Logging to file: %s", log_file)
+            sinks.append(file_handler)
         except OSError as exc:
-            log.error("Cannot open log file %r: %s — file logging disabled", log_file, exc)
+            file_error = exc
+
+    # Replace any existing handlers on the root logger
+    root.handlers.clear()
+    qh = logging.handlers.QueueHandler(_log_queue)
+    qh.setFormatter(logging.Formatter("%(message)s"))   # full format on the sinks
+    root.addHandler(qh)
+
+    if _log_listener is not None:
+        _log_listener.stop()
+    _log_listener = logging.handlers.QueueListener(_log_queue, *sinks)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)     # flush queued records on shutdown
+
+    if file_error is not None:
+        log.error("Cannot open log file %r: %s — file logging disabled", log_file, file_error)
+    elif log_file:
+        log.info("Logging to file: %s", log_file)
 
 
 def _make_self_signed_cert(cert_path: str, key_path: str) -> None:
@@ -177,30 +258,82 @@ def _build_ssl_context(cert: str, key: str) -> ssl.SSLContext:
 CFG: Dict[str, Any] = {}
 
 # ---------------------------------------------------------------------------
-# Simple TTL Cache
+# Bounded TTL Cache  (LRU order, cost-aware eviction, lazy expiry)
 # ---------------------------------------------------------------------------
-_cache: Dict[str, Any]        = {}
-_cache_ts: Dict[str, float]   = {}
+CACHE_MAX_ENTRIES = 4096   # distinct query:/incr: keys would otherwise grow forever
+_SWEEP_EVERY      = 64     # cache_set() calls between expiry sweeps
+_SWEEP_SCAN       = 32     # oldest entries examined per sweep
+_EVICT_SCAN       = 16     # least recently used entries weighed per eviction
+
+# key → [value, expires_at, cost_s, hits].  expires_at is on the
+# time.monotonic() clock and fixed when the entry is written, so a read is
+# one get() and one comparison, and wall-clock jumps (NTP, suspend) can't
+# extend or cut short an entry's life.  cost_s (how long the MCP call took)
+# and hits (bumped without the lock; a lost increment is harmless) decide
+# which entry goes when the cache is full.
+_cache: "OrderedDict[str, List[Any]]" = OrderedDict()
 _cache_lock = threading.Lock()
+_cache_sets = 0
 
 
-def cache_get(key: str, ttl: float) -> Optional[Any]:
-    with _cache_lock:
-        if key in _cache and (time.time() - _cache_ts[key]) < ttl:
-            return _cache[key]
-    return None
+def cache_get(key: str) -> Optional[Any]:
+    """
+    Wait-free on the hit path: a single OrderedDict.get() is atomic under the
+    GIL, so readers never queue behind cache_set().  The LRU bump is
+    best-effort — skipped if a writer holds the lock right now.
+    """
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    if entry[1] <= time.monotonic():     # expired — drop it now
+        with _cache_lock:
+            if _cache.get(key) is entry:         # not replaced meanwhile
+                del _cache[key]
+        return None
+    entry[3] += 1
+    if _cache_lock.acquire(blocking=False):
+        try:
+            if key in _cache:
+                _cache.move_to_end(key)
+        finally:
+            _cache_lock.release()
+    return entry[0]
+
+
+def _eviction_score(entry: List[Any], now: float) -> float:
+    """What keeping *entry* saves: its MCP cost times how often it is read.
+    Expired entries score below everything."""
+    if entry[1] <= now:
+        return -1.0
+    return entry[2] * (entry[3] + 1)
 
 
-def cache_set(key: str, value: Any) -> None:
+def cache_set(key: str, value: Any, ttl: float, cost: float = 0.0) -> None:
+    """
+    Store *value* for *ttl* seconds.  *cost* is how long it took to produce.
+
+    When the cache is full, the cheapest of the _EVICT_SCAN least recently
+    used entries is evicted rather than simply the oldest, so a burst of
+    one-off queries doesn't push out slow, often-read metadata.
+    """
+    global _cache_sets
+    now = time.monotonic()
     with _cache_lock:
-        _cache[key]    = value
-        _cache_ts[key] = time.time()
+        _cache[key] = [value, now + ttl, cost, 0]
+        _cache.move_to_end(key)
+        if len(_cache) > CACHE_MAX_ENTRIES:
+            victim, _ = min(islice(_cache.items(), _EVICT_SCAN),
+                            key=lambda kv: _eviction_score(kv[1], now))
+            del _cache[victim]
+        _cache_sets += 1
+        if _cache_sets % _SWEEP_EVERY == 0:
+            for k in [k for k, e in islice(_cache.items(), _SWEEP_SCAN) if e[1] <= now]:
+                del _cache[k]
 
 
 def cache_clear() -> None:
     with _cache_lock:
         _cache.clear()
-        _cache_ts.clear()
 
 # ---------------------------------------------------------------------------
 # Job / Worker
@@ -211,140 +344,585 @@ class Job:
     params:     Dict[str, Any]
     cache_key:  str
     cache_ttl:  float
-    done:       threading.Event = field(default_factory=threading.Event)
+    # Applied to the MCP result before it is cached, so hits come back ready
+    # to serve and endpoints don't re-extract rows on every request.
+    normalize:  Optional[Callable[[Any], Any]] = None
+    # _canon(params), encoded once in _job_key: hashed for cache_key and
+    # spliced verbatim into the tools/call frame.
+    params_json: Optional[bytes] = None
+    # Run on the worker in place of a tools/call, for jobs made of several
+    # MCP calls (UNS discovery).  Its return value is the job's result.
+    handler:    Optional[Callable[[], Any]] = None
+    finished:   bool            = False   # set under _job_cv by _job_done()
     result:     Any             = None
     error:      Optional[str]   = None
 
 
-_job_queue: queue.Queue = queue.Queue()
-_pending_jobs: Dict[str, Job] = {}   # cache_key → in-flight job (dedup)
-_pending_lock = threading.Lock()
+# One Condition for every job instead of an Event (lock + condition) each.
+# Completions are rare next to the waits they release, and a notify_all()
+# wakes every waiter at once; each re-checks only its own job's flag.  Its
+# lock also guards _pending_jobs, so joining an in-flight job and waiting
+# for it contend on a single lock, and completion is one acquire.
+_job_cv = threading.Condition()
+
+
+def _job_done(job: Job, pending: bool = False) -> None:
+    """Mark *job* finished and wake its waiters; *pending* also drops it
+    from _pending_jobs in the same critical section."""
+    with _job_cv:
+        if pending and _pending_jobs.get(job.cache_key) is job:
+            del _pending_jobs[job.cache_key]
+        job.finished = True
+        _job_cv.notify_all()
+
+
+def _job_wait(job: Job, timeout: float) -> bool:
+    """Block until *job* has finished; False on timeout."""
+    if job.finished:                    # already done: no lock at all
+        return True
+    with _job_cv:
+        return _job_cv.wait_for(lambda: job.finished, timeout=timeout)
+
+
+_job_queue: queue.Queue = queue.Queue()     # Jobs, or None to stop the worker
+_pending_jobs: Dict[str, Job] = {}   # cache_key → in-flight job (dedup); under _job_cv
+
+
+def _job_key(tool: str, params: Dict[str, Any],
+             normalize: Optional[Callable[[Any], Any]] = None,
+             key_params: Optional[Dict[str, Any]] = None) -> Tuple[bytes, str]:
+    """(canonical params, cache_key) for a job.  Normalized results live
+    under a separate ":rows" key so raw callers of the same tool never see
+    the normalized form.  *key_params*, if given, is hashed for the key in
+    place of *params*; the canonical bytes sent to MCP are always *params*."""
+    canon = _canon(params)
+    cache_key = (_ck(tool, params, canon) if key_params is None
+                 else _ck(tool, key_params))
+    if normalize is not None:
+        cache_key += ":rows"
+    return canon, cache_key
 
 
 def _enqueue(tool: str, params: Dict[str, Any],
-             cache_ttl: float = CACHE_TTL_S) -> Job:
-    """Post a job and return it. Deduplicates by cache_key."""
-    cache_key = f"{tool}:{json.dumps(params, sort_keys=True)}"
+             cache_ttl: float = CACHE_TTL_S,
+             normalize: Optional[Callable[[Any], Any]] = None,
+             key: Optional[Tuple[bytes, str]] = None,
+             handler: Optional[Callable[[], Any]] = None) -> Job:
+    """
+    Post a job and return it. Deduplicates by cache_key.
 
-    # Cache hit — return immediately with a pre-done synthetic job
-    cached = cache_get(cache_key, cache_ttl)
-    if cached is not None:
-        row_count = len(cached) if isinstance(cached, list) else "cached"
-        log.info("CACHE hit       tool=%-28s  rows=%s", tool, row_count)
-        j = Job(tool=tool, params=params, cache_key=cache_key, cache_ttl=cache_ttl)
-        j.result = cached
-        j.done.set()
-        return j
-
-    with _pending_lock:
-        if cache_key in _pending_jobs:
-            log.info("DEDUP           tool=%-28s  (joining in-flight job)", tool)
-            return _pending_jobs[cache_key]
-        j = Job(tool=tool, params=params, cache_key=cache_key, cache_ttl=cache_ttl)
-        _pending_jobs[cache_key] = j
+    Does not consult the cache: the job always reaches MCP and overwrites
+    the cached entry.  _run_job checks the cache first; the status
+    refresher calls this directly to force a fresh value.
+
+    normalize, if given, post-processes the result once in the worker.
+    key is _job_key()'s result when the caller already has it.  handler
+    replaces the tools/call (see Job.handler).
+    """
+    canon, cache_key = key or _job_key(tool, params, normalize)
+
+    j = Job(tool=tool, params=params, cache_key=cache_key, cache_ttl=cache_ttl,
+            normalize=normalize, params_json=canon, handler=handler)
+    with _job_cv:
+        existing = _pending_jobs.setdefault(cache_key, j)
+    if existing is not j:
+        log.info("DEDUP           tool=%-28s  (joining in-flight job)", tool)
+        return existing
 
     _job_queue.put(j)
     return j
 
 
+_inflight_slots = threading.BoundedSemaphore(DEFAULT_MAX_INFLIGHT)
+
+
 def _worker() -> None:
-    """Single worker: pop jobs, call MCP, set events."""
+    """
+    Single submitter: pop jobs, write their tools/call requests, move on.
+
+    The reader thread completes each job when its response id comes back.
+    Up to MAX_INFLIGHT calls may be outstanding; with the default of 1 the
+    next job is not written until the previous one has been answered.
+
+    A job with a handler is run here, to completion, holding its slot; its
+    own MCP calls go out one after another and count against that slot.
+    """
     log.info("Worker thread started")
     while True:
+        job: Optional[Job] = _job_queue.get()   # blocks; wakes as soon as a job is put
+        if job is None:                         # shutdown sentinel (_stop_worker)
+            break
+        _inflight_slots.acquire()       # released by _finish_job
+
+        if log.isEnabledFor(logging.INFO):
+            log.info("WORKER dequeue  tool=%-28s  queue_remaining=%d",
+                     job.tool, _job_queue.qsize())
+        t0 = time.time()
         try:
-            job: Job = _job_queue.get(timeout=5)
-        except queue.Empty:
+            if job.handler is not None:
+                fut = Future()
+                fut.set_result(job.handler())
+            else:
+                # Cost is timed from the send, not from dequeue: throttle
+                # sleep and connecting are not what a cached entry saves.
+                fut, t0 = _submit_tool(job.tool, job.params, job.params_json)
+        except Exception as exc:
+            fut = Future()
+            fut.set_exception(exc)
+        fut.add_done_callback(lambda f, job=job, t0=t0: _finish_job(job, f, t0))
+
+
+def _finish_job(job: Job, fut: Future, t0: float) -> None:
+    """Store a job's outcome and wake its waiters (runs on the reader thread)."""
+    try:
+        result = fut.result()
+        if job.handler is None:
+            result = _tool_result(job.tool, result, t0)
+        if job.normalize is not None:
+            result = job.normalize(result)
+        job.result = result
+        cache_set(job.cache_key, result, job.cache_ttl, time.time() - t0)
+    except Exception as exc:
+        log.error("WORKER error    tool=%-28s  err=%s", job.tool, exc)
+        job.error = str(exc)
+    finally:
+        _job_done(job, pending=True)
+        _inflight_slots.release()
+        _job_queue.task_done()
+
+
+# ---------------------------------------------------------------------------
+# Status refresher — keeps /api/status warm while dashboards poll it
+# ---------------------------------------------------------------------------
+_status_last_req = 0.0               # time.time() of the latest /api/status
+_refresh_stop    = threading.Event()
+
+
+def _refresher() -> None:
+    """
+    Re-post checkStatus at 80 % of STATUS_TTL_S so a poll never lands on an
+    expired entry and waits behind the worker.  Idle when nobody has asked for
+    /api/status within two TTLs, so an unwatched bridge makes no extra calls.
+    """
+    interval = STATUS_TTL_S * 0.8
+    while not _refresh_stop.wait(interval):
+        if time.time() - _status_last_req > STATUS_TTL_S * 2:
             continue
+        _enqueue("checkStatus", {}, cache_ttl=STATUS_TTL_S)
 
-        qd = _job_queue.qsize()
-        log.info("WORKER dequeue  tool=%-28s  queue_remaining=%d", job.tool, qd)
-        try:
-            result = _call_mcp(job.tool, job.params)
-            job.result = result
-            cache_set(job.cache_key, result)
-        except Exception as exc:
-            log.error("WORKER error    tool=%-28s  err=%s", job.tool, exc)
-            job.error = str(exc)
-        finally:
-            with _pending_lock:
-                _pending_jobs.pop(job.cache_key, None)
-            job.done.set()
-            _job_queue.task_done()
-            time.sleep(CALL_DELAY_S)
+
+# ---------------------------------------------------------------------------
+# Call rate limiter — token bucket in front of every MCP tools/call
+# ---------------------------------------------------------------------------
+_bucket_lock  = threading.Lock()
+_tokens       = float(DEFAULT_CALL_BURST)
+_last_refill  = time.monotonic()
+
+
+def _throttle() -> None:
+    """
+    Allow up to CALL_BURST calls back-to-back, then one every CALL_DELAY_S.
+
+    Replaces the flat sleep after every job: a lone request after an idle
+    spell goes out immediately, while sustained load still averages
+    1 / CALL_DELAY_S calls per second against the SSE server.
+    """
+    global _tokens, _last_refill
+    if CALL_DELAY_S <= 0:
+        return
+    with _bucket_lock:
+        now = time.monotonic()
+        _tokens = min(float(CALL_BURST), _tokens + (now - _last_refill) / CALL_DELAY_S)
+        _last_refill = now
+        wait = 0.0 if _tokens >= 1.0 else (1.0 - _tokens) * CALL_DELAY_S
+        _tokens -= 1.0               # may go negative; the sleep below repays it
+    if wait > 0:
+        time.sleep(wait)
 
 
 def start_worker() -> None:
     t = threading.Thread(target=_worker, daemon=True, name="mcp-worker")
     t.start()
+    threading.Thread(target=_refresher, daemon=True, name="status-refresher").start()
+    atexit.register(_stop_worker)
+
+
+def _stop_worker() -> None:
+    """Let the worker and refresher leave their loops at interpreter exit."""
+    _refresh_stop.set()
+    _job_queue.put(None)
 
 
 # ---------------------------------------------------------------------------
-# MCPClient — one subprocess, serialized via the worker thread
+# Direct transports (--transport sse / http) — no mcp-proxy subprocess
 # ---------------------------------------------------------------------------
-_mcp_proc: Optional[subprocess.Popen] = None
+def _sse_events(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """(event, data) pairs from the lines of a text/event-stream body."""
+    event, data = "message", []
+    for line in lines:
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event, data = "message", []
+            continue
+        if line.startswith(":"):        # comment / keep-alive
+            continue
+        name, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if name == "event":
+            event = value
+        elif name == "data":
+            data.append(value)
+
+
+class _HTTPTransport(abc.ABC):
+    """
+    Base for the direct (httpx) transports.  Stands in for the mcp-proxy
+    Popen: poll() is None while usable, send() delivers one JSON-RPC frame,
+    and responses are handed to the same id dispatcher as on stdio.
+    """
+
+    def __init__(self, url: str, verify: bool) -> None:
+        self.url    = url
+        self.error: Optional[Exception] = None
+        self._open  = True
+        # POSTs are sent under _rpc_lock or hold a pool slot, so their reads
+        # are bounded; only the SSE event stream overrides read=None.
+        self.client = httpx.Client(verify=verify,
+                                   timeout=httpx.Timeout(30.0, read=RPC_TIMEOUT_S))
+        threading.Thread(target=self._expire, daemon=True, name="mcp-http-expiry").start()
+
+    def poll(self) -> Optional[int]:
+        return None if self._open else 1
+
+    @abc.abstractmethod
+    def send(self, frame: bytes, rid: Optional[int]) -> None:
+        """Deliver one JSON-RPC frame; rid is None for notifications."""
+
+    def close(self) -> None:
+        self._open = False
+        self.client.close()
+        _expire_rpcs(self, None)
+
+    def describe_exit(self) -> str:
+        return f"MCP connection to {self.url} closed ({self.error or 'by server'})"
+
+    def _expire(self) -> None:
+        # A response can arrive long after its POST returned (SSE), so
+        # per-request deadlines are enforced here rather than by httpx.
+        while self._open:
+            time.sleep(1.0)
+            _expire_rpcs(self, time.monotonic())
+
+
+class _SSEConnection(_HTTPTransport):
+    """
+    MCP HTTP+SSE transport: one long-lived GET event stream carries every
+    response; send() POSTs each frame to the session endpoint the server
+    announces in its first "endpoint" event.
+    """
+
+    def __init__(self, url: str, verify: bool) -> None:
+        super().__init__(url, verify)
+        self.endpoint: Optional[str] = None
+        self._ready = threading.Event()
+        threading.Thread(target=self._read, daemon=True, name="mcp-sse-reader").start()
+        if not self._ready.wait(RPC_TIMEOUT_S) or self.endpoint is None:
+            self.close()
+            raise RuntimeError(f"no endpoint event from {url}: {self.error or 'timed out'}")
+
+    def send(self, frame: bytes, rid: Optional[int]) -> None:
+        r = self.client.post(self.endpoint, content=frame,
+                             headers={"Content-Type": "application/json"},
+                             timeout=RPC_TIMEOUT_S)
+        r.raise_for_status()
+
+    def _read(self) -> None:
+        try:
+            with self.client.stream("GET", self.url,
+                                    headers={"Accept": "text/event-stream"},
+                                    timeout=httpx.Timeout(30.0, read=None)) as r:
+                r.raise_for_status()
+                for event, data in _sse_events(r.iter_lines()):
+                    if event == "endpoint":
+                        self.endpoint = urljoin(self.url, data)
+                        self._ready.set()
+                    elif event == "message":
+                        _dispatch_response(data)
+        except Exception as exc:
+            self.error = exc
+            log.error("MCP SSE stream failed: %s", exc)
+        finally:
+            self._open = False
+            self._ready.set()
+            self.client.close()
+            _expire_rpcs(self, None)
+
+
+class _StreamableConnection(_HTTPTransport):
+    """
+    MCP Streamable HTTP transport: every frame is its own POST to the URL and
+    the response comes back in that POST's body.  Accept asks for plain
+    application/json, so servers that can answer a tools/call in one piece
+    skip SSE framing entirely; a text/event-stream reply is still parsed.
+    """
+
+    _ACCEPT = "application/json, text/event-stream;q=0.1"
+
+    def __init__(self, url: str, verify: bool) -> None:
+        super().__init__(url, verify)
+        self.session_id: Optional[str] = None
+        # Each POST blocks until its answer, so they run off the worker thread.
+        self._pool = ThreadPoolExecutor(max_workers=MAX_INFLIGHT + 1,
+                                        thread_name_prefix="mcp-http")
+
+    def send(self, frame: bytes, rid: Optional[int]) -> None:
+        if rid is None:                 # notification: quick 202, errors raise
+            self._post(frame, None)
+        else:
+            self._pool.submit(self._post, frame, rid)
+
+    def close(self) -> None:
+        super().close()
+        self._pool.shutdown(wait=False)
+
+    def _post(self, frame: bytes, rid: Optional[int]) -> None:
+        headers = {"Content-Type": "application/json", "Accept": self._ACCEPT}
+        if self.session_id:
+            headers["Mcp-Session-Id"] = self.session_id
+        try:
+            with self.client.stream("POST", self.url, content=frame, headers=headers,
+                                    timeout=httpx.Timeout(30.0, read=RPC_TIMEOUT_S)) as r:
+                if r.status_code == 404 and self.session_id:
+                    self._open = False  # session expired: reconnect on next call
+                r.raise_for_status()
+                self.session_id = r.headers.get("mcp-session-id", self.session_id)
+                if r.headers.get("content-type", "").startswith("text/event-stream"):
+                    for event, data in _sse_events(r.iter_lines()):
+                        if event == "message":
+                            _dispatch_response(data)
+                elif r.status_code != 202:
+                    _dispatch_response(r.read())
+        except Exception as exc:
+            if rid is not None:
+                self.error = exc
+                entry = _rpc_waiting.pop(rid, None)
+                if entry is not None:
+                    entry[0].set_exception(exc)
+            if not self._open:
+                # _expire() has stopped; nothing else will fail the session's
+                # other pending calls.
+                _expire_rpcs(self, None)
+            if rid is None:
+                raise
+
+
+# ---------------------------------------------------------------------------
+# MCPClient — one subprocess (or direct SSE connection); requests written by
+# the worker, responses matched back to callers by JSON-RPC id on a
+# dedicated reader thread
+# ---------------------------------------------------------------------------
+_Conn = Union[subprocess.Popen, _HTTPTransport]
+
+_mcp_proc: Optional[_Conn] = None
 _mcp_lock = threading.Lock()
 _req_id   = 0
+_rpc_lock = threading.Lock()        # id allocation + frame write are one step
+# id → (future, deadline on the monotonic clock, connection, method)
+_rpc_waiting: Dict[int, Tuple[Future, float, _Conn, str]] = {}
 
 
-def _get_mcp_proc() -> subprocess.Popen:
+def _get_mcp_proc() -> _Conn:
     global _mcp_proc
     with _mcp_lock:
         if _mcp_proc is None or _mcp_proc.poll() is not None:
-            log.info("Spawning mcp-proxy → %s", CFG["mcp_url"])
-            _mcp_proc = subprocess.Popen(
-                [CFG["mcp_proxy"], CFG["mcp_url"]],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-            )
+            if isinstance(_mcp_proc, _HTTPTransport):
+                _mcp_proc.close()       # release the dead session's client/pool
+            transport = CFG.get("transport", "stdio")
+            if transport in ("sse", "http"):
+                log.info("Connecting to MCP (%s) → %s", transport, CFG["mcp_url"])
+                conn_cls = _SSEConnection if transport == "sse" else _StreamableConnection
+                _mcp_proc = conn_cls(CFG["mcp_url"], CFG.get("mcp_verify", True))
+            else:
+                log.info("Spawning mcp-proxy → %s", CFG["mcp_url"])
+                _mcp_proc = subprocess.Popen(
+                    [CFG["mcp_proxy"], CFG["mcp_url"]],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    # Binary, 64 KiB block buffers: large tool results are read
+                    # in a few syscalls and parsed as bytes; _send_rpc writes
+                    # each request whole and flushes.
+                    bufsize=65536,
+                )
+                threading.Thread(target=_read_responses, args=(_mcp_proc,),
+                                 daemon=True, name="mcp-reader").start()
             # MCP initialize handshake
-            _send_rpc(_mcp_proc, "initialize", {
+            _rpc_result(_send_rpc(_mcp_proc, "initialize", {
                 "protocolVersion": "2024-11-05",
                 "capabilities": {},
                 "clientInfo": {"name": "mcp-web-bridge", "version": "4.0"},
-            })
+            }), "initialize")
             _send_rpc(_mcp_proc, "notifications/initialized", {})
         return _mcp_proc
 
 
-def _send_rpc(proc: subprocess.Popen, method: str,
-              params: Dict[str, Any]) -> Optional[Dict]:
-    global _req_id
-    _req_id += 1
-    req = {"jsonrpc": "2.0", "id": _req_id, "method": method, "params": params}
-    line = json.dumps(req) + "\n"
-    proc.stdin.write(line)
-    proc.stdin.flush()
+def _rpc_result(fut: Future, method: str) -> Dict:
+    """
+    fut.result(), bounded by RPC_TIMEOUT_S.  The expiry loops normally fail
+    an overdue request first; this covers a transport that stalled without
+    getting as far as either.
+    """
+    try:
+        return fut.result(timeout=RPC_TIMEOUT_S)
+    except FutureTimeout:
+        raise TimeoutError(f"No response for method={method}") from None
 
-    if method == "notifications/initialized":
-        return None
 
-    # Read until we get the response matching our id
-    deadline = time.time() + 45
-    while time.time() < deadline:
-        raw = proc.stdout.readline()
-        if not raw:
-            time.sleep(0.05)
-            continue
+def _send_rpc(proc: _Conn, method: str,
+              params: Dict[str, Any],
+              params_json: Optional[bytes] = None) -> Optional[Future]:
+    """
+    Write one request and return a Future for its response message, or None
+    for a notification.  The reader thread resolves the Future, or fails it
+    after RPC_TIMEOUT_S.
+
+    *params_json*, if given, is the already-encoded params object and is
+    spliced into the frame as-is instead of re-encoding *params*.
+    """
+    global _req_id
+    if params_json is None:
+        params_json = _dumps(params)
+    with _rpc_lock:
+        if method.startswith("notifications/"):
+            fut, rid = None, None
+            frame = b'{"jsonrpc":"2.0","method":"%s","params":%s}\n' % (
+                method.encode(), params_json)
+        else:
+            _req_id += 1
+            fut, rid = Future(), _req_id
+            frame = b'{"jsonrpc":"2.0","id":%d,"method":"%s","params":%s}\n' % (
+                rid, method.encode(), params_json)
+            _rpc_waiting[rid] = (fut, time.monotonic() + RPC_TIMEOUT_S, proc, method)
         try:
-            msg = json.loads(raw)
-            if msg.get("id") == _req_id:
-                return msg
-        except json.JSONDecodeError:
+            if isinstance(proc, _HTTPTransport):
+                proc.send(frame, rid)
+            else:
+                proc.stdin.write(frame)
+                proc.stdin.flush()
+        except Exception:
+            _rpc_waiting.pop(rid, None)
+            raise
+    return fut
+
+
+def _read_responses(proc: subprocess.Popen) -> None:
+    """
+    Sole reader of *proc*'s stdout: split it into newline-framed messages and
+    resolve the Future waiting on each response id.  A selector with a short
+    timeout lets it expire overdue requests while the pipe is quiet (Windows
+    can't select() on pipes and falls back to blocking readline()).  Returns
+    when mcp-proxy closes stdout, failing whatever was still waiting on it.
+    """
+    fd = proc.stdout.fileno()
+    sel: Optional[selectors.BaseSelector] = None
+    if os.name != "nt":
+        sel = selectors.DefaultSelector()
+        os.set_blocking(fd, False)
+        sel.register(fd, selectors.EVENT_READ)
+    buf = bytearray()
+    try:
+        while True:
+            if sel is None:
+                line = proc.stdout.readline()
+                if not line:
+                    break
+                _dispatch_response(line)
+            elif sel.select(timeout=1.0):
+                try:
+                    chunk = os.read(fd, 65536)
+                except BlockingIOError:
+                    continue
+                if not chunk:
+                    break
+                scan = len(buf)             # earlier bytes hold no newline
+                buf += chunk
+                nl = buf.find(b"\n", scan)
+                while nl >= 0:
+                    _dispatch_response(bytes(buf[:nl]))
+                    del buf[:nl + 1]
+                    nl = buf.find(b"\n")
+            _expire_rpcs(proc, time.monotonic())
+    except Exception as exc:
+        log.error("MCP reader failed: %s", exc)
+    finally:
+        if sel is not None:
+            sel.close()
+        try:
+            proc.wait(timeout=1)            # reap it so the exit code is known
+        except subprocess.TimeoutExpired:
+            pass
+        _expire_rpcs(proc, None)
+
+
+def _dispatch_response(line: Union[bytes, str]) -> None:
+    if not line.strip():
+        return
+    try:
+        msg = _loads(line)
+    except json.JSONDecodeError:
+        return
+    if not isinstance(msg, dict) or not isinstance(msg.get("id"), int):
+        return                          # notification / log line / stray output
+    entry = _rpc_waiting.pop(msg["id"], None)
+    if entry is not None:
+        entry[0].set_result(msg)
+
+
+def _expire_rpcs(proc: _Conn, now: Optional[float]) -> None:
+    """Fail *proc*'s requests past their deadline; all of them if now is None."""
+    for rid, (_, deadline, p, method) in list(_rpc_waiting.items()):
+        if p is not proc or (now is not None and deadline > now):
             continue
-    raise TimeoutError(f"No response for id={_req_id} method={method}")
+        entry = _rpc_waiting.pop(rid, None)
+        if entry is None:
+            continue                    # answered meanwhile
+        if now is None:
+            why = (proc.describe_exit() if isinstance(proc, _HTTPTransport)
+                   else f"mcp-proxy exited (code {proc.poll()})")
+            entry[0].set_exception(RuntimeError(
+                f"{why} before answering id={rid} method={method}"))
+        else:
+            entry[0].set_exception(TimeoutError(f"No response for id={rid} method={method}"))
+
+
+def _submit_tool(tool: str, params: Dict[str, Any],
+                 params_json: Optional[bytes] = None) -> Tuple[Future, float]:
+    """
+    Rate-limit and write a tools/call request.  Returns its response Future
+    and the time.time() it was sent, i.e. after the throttle let it through.
+    """
+    if params_json is None:
+        params_json = _canon(params)
+    if log.isEnabledFor(logging.INFO):
+        log.info("MCP ▶  tool=%-28s  params=%s", tool,
+                 params_json[:200].decode("utf-8", "replace"))
+    proc = _get_mcp_proc()
+    _throttle()
+    call = b'{"name":%s,"arguments":%s}' % (_dumps(tool), params_json)
+    t0 = time.time()
+    return _send_rpc(proc, "tools/call", {"name": tool, "arguments": params}, call), t0
 
 
 def _call_mcp(tool: str, params: Dict[str, Any]) -> Any:
-    """Call an MCP tool and return parsed result. Called ONLY from worker thread."""
-    t0 = time.time()
-    param_summary = json.dumps(params)[:200]
-    log.info("MCP ▶  tool=%-28s  params=%s", tool, param_summary)
-    proc = _get_mcp_proc()
-    resp = _send_rpc(proc, "tools/call", {"name": tool, "arguments": params})
+    """Call an MCP tool, wait for it, and return the parsed result."""
+    fut, t0 = _submit_tool(tool, params)
+    return _tool_result(tool, _rpc_result(fut, "tools/call"), t0)
+
 
+def _tool_result(tool: str, resp: Optional[Dict], t0: float) -> Any:
+    """Unwrap a tools/call response message into the tool's parsed result."""
     if resp is None:
         log.warning("MCP ◀  tool=%-28s  → None response", tool)
         return None
@@ -366,27 +944,55 @@ def _call_mcp(tool: str, params: Dict[str, Any]) -> Any:
                     break
             log.error("MCP ✗  tool=%-28s  → isError: %s", tool, err_text[:200])
             raise RuntimeError(f"MCP tool error: {err_text}")
-        texts = [c["text"] for c in result["content"] if c.get("type") == "text"]
-        combined = "\n".join(texts)
-        try:
-            parsed = json.loads(combined)
-            row_count = len(parsed) if isinstance(parsed, list) else "dict"
-            ms = int((time.time() - t0) * 1000)
-            log.info("MCP ◀  tool=%-28s  → %s rows  (%dms)", tool, row_count, ms)
-            return parsed
-        except json.JSONDecodeError:
-            ms = int((time.time() - t0) * 1000)
-            log.info("MCP ◀  tool=%-28s  → text (%d chars)  (%dms)", tool, len(combined), ms)
-            return combined
-
-    ms = int((time.time() - t0) * 1000)
-    log.info("MCP ◀  tool=%-28s  → raw result  (%dms)", tool, ms)
+        # Only try a JSON parse when the text looks like an object/array —
+        # plain-text results (checkStatus etc.) skip the doomed parse.
+        content = result["content"]
+        if (len(content) == 1 and isinstance(content[0], dict)
+                and content[0].get("type") == "text"):
+            # The usual shape: one block, parsed in place with no copy.
+            buf = content[0].get("text") or ""
+            head = buf[:64].lstrip()[:1]
+        else:
+            # Concatenate the text blocks straight into one buffer.
+            buf = bytearray()
+            for c in content:
+                if isinstance(c, dict) and c.get("type") == "text" and c.get("text"):
+                    if buf:
+                        buf += b"\n"
+                    buf += c["text"].encode("utf-8")
+            head = buf[:64].lstrip()[:1].decode("latin-1")
+        if head in ("{", "["):
+            try:
+                parsed = _loads(buf)
+                if log.isEnabledFor(logging.INFO):
+                    log.info("MCP ◀  tool=%-28s  → %s rows  (%dms)", tool,
+                             len(parsed) if isinstance(parsed, list) else "dict",
+                             int((time.time() - t0) * 1000))
+                return parsed
+            except json.JSONDecodeError:
+                pass
+        combined = buf if isinstance(buf, str) else buf.decode("utf-8")
+        if log.isEnabledFor(logging.INFO):
+            log.info("MCP ◀  tool=%-28s  → text (%d chars)  (%dms)", tool,
+                     len(combined), int((time.time() - t0) * 1000))
+        return combined
+
+    if log.isEnabledFor(logging.INFO):
+        log.info("MCP ◀  tool=%-28s  → raw result  (%dms)", tool,
+                 int((time.time() - t0) * 1000))
     return result
 
 
 # ---------------------------------------------------------------------------
 # UNS database discovery
 # ---------------------------------------------------------------------------
+def _db_name(item: Any) -> Any:
+    """Database name from one listNetworkDatabases entry (dict or bare name)."""
+    if isinstance(item, dict):
+        return item.get("dbms") or item.get("name") or item.get("database")
+    return item
+
+
 def _discover_databases_from_uns() -> List[str]:
     """
     Query all UNS policies for this MCP connector and collect the unique set
@@ -395,36 +1001,21 @@ def _discover_databases_from_uns() -> List[str]:
     """
     dbs = set()
 
-    # 1. Try listPolicyTypes to confirm 'uns' exists
+    # 1. Collect dbms fields from the UNS policies.  No listPolicyTypes probe
+    #    first: a network without a 'uns' type just returns no policies (or
+    #    an error), which lands in the same fallback for one call less.
     try:
-        policy_types_raw = _call_mcp("listPolicyTypes", {})
-        has_uns = False
-        if isinstance(policy_types_raw, list):
-            has_uns = any(
-                (p.get("policy") if isinstance(p, dict) else p) == "uns"
-                for p in policy_types_raw
-            )
-        elif isinstance(policy_types_raw, dict) and "policies" in policy_types_raw:
-            has_uns = any(p.get("policy") == "uns"
-                         for p in policy_types_raw["policies"])
-
-        if has_uns:
-            uns_raw = _call_mcp("listPolicies", {"policyType": "uns"})
-            policies = []
-            if isinstance(uns_raw, list):
-                policies = uns_raw
-            elif isinstance(uns_raw, dict):
-                policies = uns_raw.get("policies", uns_raw.get("result", []))
-
-            for p in policies:
-                pol = p.get("uns", p) if isinstance(p, dict) else {}
-                dbms = pol.get("dbms")
-                if dbms:
-                    dbs.add(dbms)
-
-            if dbs:
-                log.info("UNS discovery found databases: %s", sorted(dbs))
-                return sorted(dbs)
+        uns_raw = _call_mcp("listPolicies", {"policyType": "uns"})
+        policies = _extract(uns_raw, "policies", "result")
+        dbs.update(pol.get("dbms")
+                   for p in policies if isinstance(p, dict)
+                   for pol in (p.get("uns", p),) if isinstance(pol, dict))
+        dbs -= {None, ""}
+
+        if dbs:
+            found = sorted(dbs)
+            log.info("UNS discovery found databases: %s", found)
+            return found
 
     except Exception as exc:
         log.warning("UNS policy scan failed (%s), falling back to listNetworkDatabases", exc)
@@ -432,23 +1023,13 @@ def _discover_databases_from_uns() -> List[str]:
     # 2. Fallback: listNetworkDatabases
     try:
         raw = _call_mcp("listNetworkDatabases", {})
-        if isinstance(raw, list):
-            for item in raw:
-                if isinstance(item, dict):
-                    dbms = item.get("dbms") or item.get("name") or item.get("database")
-                    if dbms:
-                        dbs.add(dbms)
-                elif isinstance(item, str):
-                    dbs.add(item)
-        elif isinstance(raw, dict):
-            for k in ("databases", "dbms", "result"):
-                if k in raw:
-                    for item in (raw[k] if isinstance(raw[k], list) else [raw[k]]):
-                        dbms = item.get("dbms") or item.get("name") if isinstance(item, dict) else item
-                        if dbms:
-                            dbs.add(str(dbms))
-                    break
-        log.info("listNetworkDatabases found: %s", sorted(dbs))
+        items = _extract(raw, "databases", "dbms", "result")
+        if not isinstance(items, list):
+            items = [items]
+        dbs.update(str(name) for name in map(_db_name, items) if name)
+        found = sorted(dbs)
+        log.info("listNetworkDatabases found: %s", found)
+        return found
     except Exception as exc:
         log.error("listNetworkDatabases also failed: %s", exc)
 
@@ -461,12 +1042,49 @@ def _discover_databases_from_uns() -> List[str]:
 app = Flask(__name__)
 CORS(app)
 
-import time as _time
+if orjson is not None:
+    class ORJSONProvider(DefaultJSONProvider):
+        """jsonify() / get_json() through orjson; Flask's default() for other types."""
+
+        def _option(self, sort_keys: bool, indent: bool) -> int:
+            option = orjson.OPT_NON_STR_KEYS
+            if sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            return option
+
+        def dumps(self, obj, **kwargs) -> str:
+            option = self._option(kwargs.get("sort_keys", self.sort_keys),
+                                  bool(kwargs.get("indent")))
+            return orjson.dumps(obj, default=self.default, option=option).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+        def response(self, *args, **kwargs):
+            # Hand orjson's bytes straight to the Response: no str round trip
+            # for multi-MB query results.
+            obj = self._prepare_response_obj(args, kwargs)
+            indent = (self.compact is None and self._app.debug) or self.compact is False
+            body = orjson.dumps(obj, default=self.default,
+                                option=self._option(self.sort_keys, indent)
+                                | orjson.OPT_APPEND_NEWLINE)
+            return self._app.response_class(body, mimetype=self.mimetype)
+
+    app.json = ORJSONProvider(app)
+
+# Endpoints that dashboards poll every few seconds: they skip the request
+# logging hooks, which would otherwise cost more than the (cached) handler
+# and bury real traffic in the log.
+_QUIET_PATHS = frozenset(("/api/status", "/api/worker/status"))
+
 
 @app.before_request
 def _before():
-    from flask import g
-    g._t0 = _time.time()
+    if request.path in _QUIET_PATHS or not log.isEnabledFor(logging.INFO):
+        return
+    g._t0 = time.time()
     if request.method == "POST":
         body = request.get_data(as_text=True)
         log.info("HTTP ▶  %s %s  body=%s", request.method, request.path,
@@ -477,27 +1095,74 @@ def _before():
 
 @app.after_request
 def _after(response):
-    from flask import g
-    ms = int((_time.time() - getattr(g, "_t0", _time.time())) * 1000)
+    t0 = g.get("_t0")
+    if t0 is None:                      # quiet path, INFO off, or a hook was skipped
+        return response
+    ms = int((time.time() - t0) * 1000)
     log.info("HTTP ◀  %s %s  status=%d  (%dms)",
              request.method, request.path, response.status_code, ms)
     return response
 
 
-def _run_job(tool: str, params: Dict, ttl: float = CACHE_TTL_S):
-    """Enqueue a job, wait for it, return (result, error_str)."""
-    job = _enqueue(tool, params, cache_ttl=ttl)
-    if not job.done.wait(timeout=JOB_TIMEOUT_S):
+def _run_job(tool: str, params: Dict, ttl: float = CACHE_TTL_S,
+             normalize: Optional[Callable[[Any], Any]] = None,
+             key_params: Optional[Dict] = None):
+    """Enqueue a job, wait for it, return (result, error_str).  key_params
+    overrides what the cache/dedup key is built from (see _job_key)."""
+    # Hit path: one dict lookup, no Job, no lock, no wait.
+    key = _job_key(tool, params, normalize, key_params)
+    cached = cache_get(key[1])
+    if cached is not None:
+        if log.isEnabledFor(logging.INFO):
+            log.info("CACHE hit       tool=%-28s  rows=%s", tool,
+                     len(cached) if isinstance(cached, list) else
+                     cached.row_count if isinstance(cached, EncodedRows) else "cached")
+        return cached, None
+    job = _enqueue(tool, params, cache_ttl=ttl, normalize=normalize, key=key)
+    if not _job_wait(job, JOB_TIMEOUT_S):
         return None, "timeout waiting for MCP worker"
     if job.error:
         return None, job.error
     return job.result, None
 
 
+def _extract(result: Any, *keys: str) -> Any:
+    """
+    Unwrap a tool result that is either a bare list or a dict holding it:
+    the list itself, else the first of *keys* set in the dict, else [].
+    Parsed JSON is never a subclass, so exact type() checks suffice.
+    """
+    t = type(result)
+    if t is list:
+        return result
+    if t is dict:
+        for k in keys:
+            v = result.get(k)
+            if v is not None:
+                return v
+    return []
+
+
+def _list_field(*keys: str) -> Callable[[Any], List]:
+    """Normalizer for tools that answer either a bare list or a dict
+    wrapping it under one of *keys*."""
+    def _normalize(result: Any) -> List:
+        return _extract(result, *keys)
+    return _normalize
+
+
+_policy_list   = _list_field("policies")
+_table_list    = _list_field("tables")
+_column_list   = _list_field("columns")
+_database_list = _list_field("databases")
+
+
 # ── Status ──────────────────────────────────────────────────────────────────
 @app.route("/api/status")
 def api_status():
-    result, err = _run_job("checkStatus", {}, ttl=30)
+    global _status_last_req
+    _status_last_req = time.time()
+    result, err = _run_job("checkStatus", {}, ttl=STATUS_TTL_S)
     if err:
         return jsonify({"status": "error", "error": err,
                         "mcp_url": CFG.get("mcp_url")}), 503
@@ -512,37 +1177,17 @@ def api_uns_databases():
     Discover all databases referenced in UNS policies for the active MCP
     connector. Results cached for CACHE_TTL_S.
     """
-    cache_key = f"uns_databases:{CFG.get('mcp_url')}"
-    cached = cache_get(cache_key, CACHE_TTL_S)
+    key = _job_key("uns_databases", {"mcp_url": CFG.get("mcp_url")})
+    cached = cache_get(key[1])
     if cached is not None:
         return jsonify({"databases": cached, "source": "cache",
                         "mcp_url": CFG.get("mcp_url")})
 
-    # Run discovery in worker context by using a custom job
-    job = Job(
-        tool="__uns_discover_databases__",
-        params={},
-        cache_key=cache_key,
-        cache_ttl=CACHE_TTL_S,
-    )
-
-    def _run():
-        try:
-            dbs = _discover_databases_from_uns()
-            job.result = dbs
-            cache_set(cache_key, dbs)
-        except Exception as exc:
-            job.error = str(exc)
-        finally:
-            job.done.set()
-
-    # Run directly in a short-lived thread so it uses the same _call_mcp path
-    # but still respects CALL_DELAY_S via the worker queue for each sub-call.
-    # We enqueue the individual sub-calls inside _discover_databases_from_uns
-    # so they all go through the single-worker queue.
-    t = threading.Thread(target=_run, daemon=True)
-    t.start()
-    if not job.done.wait(timeout=JOB_TIMEOUT_S * 2):
+    # Discovery runs on the worker like any other job, so concurrent loads
+    # share one run and its sub-calls are paced with everything else.
+    job = _enqueue("uns_databases", {"mcp_url": CFG.get("mcp_url")}, key=key,
+                   handler=_discover_databases_from_uns)
+    if not _job_wait(job, JOB_TIMEOUT_S * 2):
         return jsonify({"error": "timeout during UNS database discovery"}), 504
     if job.error:
         return jsonify({"error": job.error}), 500
@@ -554,10 +1199,9 @@ def api_uns_databases():
 # ── UNS: full policy list ────────────────────────────────────────────────────
 @app.route("/api/uns/discover")
 def api_uns_discover():
-    result, err = _run_job("listPolicies", {"policyType": "uns"})
+    policies, err = _run_job("listPolicies", {"policyType": "uns"}, normalize=_policy_list)
     if err:
         return jsonify({"error": err}), 500
-    policies = result if isinstance(result, list) else result.get("policies", []) if isinstance(result, dict) else []
     return jsonify({"policies": policies, "count": len(policies),
                     "mcp_url": CFG.get("mcp_url")})
 
@@ -569,10 +1213,9 @@ def api_uns_policies():
     params = {"policyType": policy_type}
     if where:
         params["whereCond"] = where
-    result, err = _run_job("listPolicies", params)
+    policies, err = _run_job("listPolicies", params, normalize=_policy_list)
     if err:
         return jsonify({"error": err}), 500
-    policies = result if isinstance(result, list) else result.get("policies", []) if isinstance(result, dict) else []
     return jsonify({"policies": policies, "count": len(policies)})
 
 
@@ -582,10 +1225,9 @@ def api_tables():
     dbms = request.args.get("dbms", "")
     if not dbms:
         return jsonify({"error": "?dbms= required"}), 400
-    result, err = _run_job("listTables", {"dbms": dbms})
+    tables, err = _run_job("listTables", {"dbms": dbms}, normalize=_table_list)
     if err:
         return jsonify({"error": err}), 500
-    tables = result if isinstance(result, list) else result.get("tables", []) if isinstance(result, dict) else []
     return jsonify({"dbms": dbms, "tables": tables})
 
 
@@ -595,23 +1237,95 @@ def api_columns():
     table = request.args.get("table", "")
     if not dbms or not table:
         return jsonify({"error": "?dbms= and ?table= required"}), 400
-    result, err = _run_job("listColumns", {"dbms": dbms, "table": table})
+    cols, err = _run_job("listColumns", {"dbms": dbms, "table": table}, normalize=_column_list)
     if err:
         return jsonify({"error": err}), 500
-    cols = result if isinstance(result, list) else result.get("columns", []) if isinstance(result, dict) else []
     return jsonify({"dbms": dbms, "table": table, "columns": cols})
 
 
 @app.route("/api/databases")
 def api_databases():
-    result, err = _run_job("listNetworkDatabases", {})
+    dbs, err = _run_job("listNetworkDatabases", {}, normalize=_database_list)
     if err:
         return jsonify({"error": err}), 500
-    dbs = result if isinstance(result, list) else result.get("databases", []) if isinstance(result, dict) else []
     return jsonify({"databases": dbs})
 
 
 # ── Query ────────────────────────────────────────────────────────────────────
+@dataclass
+class EncodedRows:
+    """A row list as cached for /api/query*: already JSON-encoded."""
+    row_count: int
+    body:      bytes     # _canon(rows)
+
+
+def _encoded(extract: Callable[[Any], List]) -> Callable[[Any], EncodedRows]:
+    """Normalizer that pulls rows out with *extract* and encodes them once,
+    in the worker, so cache hits are served without re-serializing."""
+    def _normalize(result: Any) -> EncodedRows:
+        rows = extract(result)
+        return EncodedRows(len(rows), _canon(rows))
+    return _normalize
+
+
+# A quoted literal/identifier (kept verbatim) or a run of whitespace.
+_SQL_WS_RE = re.compile(r"""('(?:[^']|'')*'|"(?:[^"]|"")*")|\s+""")
+
+
+def _ws_sub(m: "re.Match") -> str:
+    if m.group(1):
+        return m.group(1)
+    # A newline ends a "--" comment, so it must not become a plain space.
+    return "\n" if "\n" in m.group(0) else " "
+
+
+def _norm_sql(sql: str) -> str:
+    """
+    Collapse whitespace outside quotes so reformatted copies of one query
+    share a cache key.  Only the key: the SQL sent to MCP is the caller's.
+    Runs containing a newline become one newline, so "--" comments keep
+    their extent.  Case is left alone: literals and quoted names are
+    case-sensitive, and folding only keywords isn't worth a tokenizer.
+    """
+    return _SQL_WS_RE.sub(_ws_sub, sql).strip()
+
+
+_query_body     = _encoded(_list_field("results", "rows"))
+_increment_body = _encoded(_list_field("results"))
+
+STREAM_MIN_ROWS = 2000   # larger results are sent in STREAM_CHUNK slices
+STREAM_CHUNK = 64 * 1024
+
+
+def _slices(parts: List[bytes]) -> Iterator[bytes]:
+    for part in parts:
+        for i in range(0, len(part), STREAM_CHUNK):
+            yield part[i:i + STREAM_CHUNK]
+
+
+def _rows_response(rows: EncodedRows, **extra: Any) -> Response:
+    """
+    jsonify({"results": rows, "row_count": ..., **extra}), built by splicing
+    the cached encoding between the other keys (sorted, exactly as jsonify()
+    orders them).  A large result goes out as STREAM_CHUNK slices of the
+    cached bytes, so the request thread never holds a second full copy of a
+    multi-MB body; Content-Length is still set since the size is known.
+    """
+    body = {"results": None, "row_count": rows.row_count, **extra}
+    parts = []
+    sep = b"{"
+    for k in sorted(body):
+        parts.append(sep + _canon(k) + b":")
+        parts.append(rows.body if k == "results" else _canon(body[k]))
+        sep = b","
+    parts.append(b"}\n")
+    if rows.row_count <= STREAM_MIN_ROWS:
+        return Response(b"".join(parts), mimetype="application/json")
+    resp = Response(_slices(parts), mimetype="application/json")
+    resp.content_length = sum(map(len, parts))
+    return resp
+
+
 @app.route("/api/query", methods=["POST"])
 @app.route("/api/mcp/query", methods=["POST"])   # legacy alias
 def api_query():
@@ -622,13 +1336,14 @@ def api_query():
     if not dbms or not sql:
         return jsonify({"error": "body must contain {dbms, sql}"}), 400
     params = {"dbms": dbms, "sql": sql}
+    key_params = dict(params, sql=_norm_sql(sql))
     if nodes:
-        params["nodes"] = nodes
-    result, err = _run_job("executeQuery", params, ttl=DATA_TTL_S)
+        params["nodes"] = key_params["nodes"] = nodes
+    rows, err = _run_job("executeQuery", params, ttl=DATA_TTL_S,
+                         normalize=_query_body, key_params=key_params)
     if err:
         return jsonify({"error": err}), 500
-    rows = result if isinstance(result, list) else result.get("results", result.get("rows", [])) if isinstance(result, dict) else []
-    return jsonify({"results": rows, "row_count": len(rows), "dbms": dbms})
+    return _rows_response(rows, dbms=dbms)
 
 
 # ── Incremental query ─────────────────────────────────────────────────────────
@@ -654,11 +1369,11 @@ def api_query_increment():
     if "nodes" in body:
         params["nodes"] = body["nodes"]
 
-    result, err = _run_job("queryWithIncrement", params, ttl=DATA_TTL_S)
+    rows, err = _run_job("queryWithIncrement", params, ttl=DATA_TTL_S,
+                         normalize=_increment_body)
     if err:
         return jsonify({"error": err}), 500
-    rows = result if isinstance(result, list) else result.get("results", []) if isinstance(result, dict) else []
-    return jsonify({"results": rows, "row_count": len(rows)})
+    return _rows_response(rows)
 
 
 # ── Nodes ────────────────────────────────────────────────────────────────────
@@ -693,27 +1408,33 @@ def api_cache_clear():
 # ── Worker status ─────────────────────────────────────────────────────────────
 @app.route("/api/worker/status")
 def api_worker_status():
-    with _pending_lock:
-        in_flight = list(_pending_jobs.keys())
+    in_flight = list(_pending_jobs)      # one C-level copy; no lock needed
     return jsonify({
         "queue_depth": _job_queue.qsize(),
         "in_flight":   in_flight,
+        "rpc_in_flight": len(_rpc_waiting),
+        "max_inflight":  MAX_INFLIGHT,
         "call_delay_s": CALL_DELAY_S,
         "mcp_url": CFG.get("mcp_url"),
     })
 
 
 # ── Dashboard serve ───────────────────────────────────────────────────────────
+_DASHBOARD_DIR   = os.path.dirname(os.path.abspath(__file__))
+_DASHBOARD_FILES = ("timbergrove_dashboard.html",
+                    "enterprise_c_spc_mcp_dashboard.html",
+                    "dashboard.html")
+# Picked once at import; a dashboard added later needs a restart.
+_DASHBOARD = next((n for n in _DASHBOARD_FILES
+                   if os.path.isfile(os.path.join(_DASHBOARD_DIR, n))), None)
+
+
 @app.route("/")
 def index():
-    import os
-    for name in ["timbergrove_dashboard.html",
-                 "enterprise_c_spc_mcp_dashboard.html",
-                 "dashboard.html"]:
-        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
-        if os.path.exists(path):
-            with open(path) as f:
-                return f.read()
+    # send_from_directory streams the file (sendfile where available) and
+    # answers If-None-Match / If-Modified-Since with 304s.
+    if _DASHBOARD is not None:
+        return send_from_directory(_DASHBOARD_DIR, _DASHBOARD, conditional=True)
     return (
         "<h1>MCP Web Bridge v4.0</h1>"
         "<p>MCP: <code>" + CFG.get("mcp_url", "?") + "</code></p>"
@@ -724,12 +1445,67 @@ def index():
     )
 
 
+# ---------------------------------------------------------------------------
+# HTTP server
+# ---------------------------------------------------------------------------
+def _gunicorn_available() -> bool:
+    try:
+        import gunicorn.app.base  # noqa: F401  (POSIX only; needs fcntl)
+        return True
+    except ImportError:
+        return False
+
+
+def _serve_gunicorn(threads: int, cert: Optional[str], key: Optional[str]) -> None:
+    """
+    Serve `app` from an embedded gunicorn with ONE gthread worker.
+
+    One worker is mandatory: the mcp-proxy subprocess, job queue and cache
+    are process-local.  The worker thread is started in the forked worker
+    (post_worker_init), never in the arbiter; so is a log listener, since
+    the arbiter's does not survive fork().
+    """
+    from gunicorn.app.base import BaseApplication
+
+    def _post_worker_init(worker) -> None:
+        global _log_listener
+        if _log_listener is not None:
+            _log_listener = logging.handlers.QueueListener(
+                _log_queue, *_log_listener.handlers)
+            _log_listener.start()
+            atexit.register(_log_listener.stop)
+        start_worker()
+
+    options = {
+        "bind":             f"{CFG['host']}:{CFG['port']}",
+        "workers":          1,
+        "worker_class":     "gthread",
+        "threads":          threads,
+        "keepalive":        30,          # dashboards poll; reuse their sockets
+        "timeout":          JOB_TIMEOUT_S * 3,
+        "post_worker_init": _post_worker_init,
+    }
+    if cert and key:
+        options["certfile"] = cert
+        options["keyfile"]  = key
+
+    class _BridgeApp(BaseApplication):
+        def load_config(self):
+            for name, value in options.items():
+                self.cfg.set(name, value)
+
+        def load(self):
+            return app
+
+    _BridgeApp().run()
+
+
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
 def main() -> None:
-    # global must be declared before CALL_DELAY_S is assigned in this scope
-    global CALL_DELAY_S
+    # globals must be declared before they are assigned in this scope
+    global CALL_DELAY_S, CALL_BURST, MAX_INFLIGHT, _tokens, _inflight_slots
 
     parser = argparse.ArgumentParser(
         description="MCP Web Bridge v4.0 — HTTP ↔ AnyLog MCP SSE proxy",
@@ -745,6 +1521,19 @@ def main() -> None:
         default=DEFAULT_MCP_PROXY_PATH,
         help="Path to the mcp-proxy binary",
     )
+    parser.add_argument(
+        "--transport",
+        choices=("stdio", "sse", "http"),
+        default="stdio",
+        help="How to reach the MCP server: through the mcp-proxy subprocess (stdio), "
+             "or directly with httpx over HTTP+SSE (sse) or Streamable HTTP (http)",
+    )
+    parser.add_argument(
+        "--mcp-insecure",
+        action="store_true",
+        help="With --transport sse/http, skip TLS certificate verification "
+             "(self-signed MCP servers)",
+    )
     parser.add_argument(
         "--port", "-p",
         type=int,
@@ -760,7 +1549,32 @@ def main() -> None:
         "--call-delay",
         type=float,
         default=DEFAULT_CALL_DELAY_S,
-        help="Seconds to pause between MCP calls (prevents SSE server overload)",
+        help="Sustained seconds between MCP calls (prevents SSE server overload)",
+    )
+    parser.add_argument(
+        "--call-burst",
+        type=int,
+        default=DEFAULT_CALL_BURST,
+        help="MCP calls allowed back-to-back after an idle period before --call-delay spacing applies",
+    )
+    parser.add_argument(
+        "--max-inflight",
+        type=int,
+        default=DEFAULT_MAX_INFLIGHT,
+        help="MCP calls allowed to await a response at once (1 = strictly one at a time)",
+    )
+    parser.add_argument(
+        "--server",
+        choices=("auto", "gunicorn", "werkzeug"),
+        default="auto",
+        help="HTTP server: gunicorn (one gthread worker, keep-alive) or the Werkzeug "
+             "dev server; auto picks gunicorn when installed and --debug is off",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=DEFAULT_HTTP_THREADS,
+        help="HTTP handler threads when serving with gunicorn",
     )
     parser.add_argument(
         "--debug",
@@ -813,14 +1627,24 @@ def main() -> None:
     # Populate runtime config
     CFG["mcp_url"]    = args.mcp_url
     CFG["mcp_proxy"]  = args.mcp_proxy
+    CFG["transport"]  = args.transport
+    CFG["mcp_verify"] = not args.mcp_insecure
     CFG["port"]       = args.port
     CFG["host"]       = args.host
 
     CALL_DELAY_S = args.call_delay
+    CALL_BURST   = max(1, args.call_burst)
+    _tokens      = float(CALL_BURST)
+    MAX_INFLIGHT = max(1, args.max_inflight)
+    _inflight_slots = threading.BoundedSemaphore(MAX_INFLIGHT)
 
     # Apply logging configuration (quiet / debug / log-file)
     _configure_logging(quiet=args.quiet, log_file=args.log_file, debug=args.debug)
 
+    if args.transport != "stdio" and httpx is None:
+        log.error("--transport %s requires httpx (pip install httpx)", args.transport)
+        sys.exit(1)
+
     # ── Resolve TLS certificate ───────────────────────────────────────────────
     ssl_context = None
     if use_ssl:
@@ -845,6 +1669,12 @@ def main() -> None:
         log.info("TLS enabled: cert=%s  key=%s", cert_path, key_path)
 
     scheme = "https" if use_ssl else "http"
+    server = args.server
+    if server == "auto":
+        server = "gunicorn" if (not args.debug and _gunicorn_available()) else "werkzeug"
+    elif server == "gunicorn" and not _gunicorn_available():
+        log.error("--server gunicorn requested but gunicorn is not installed (pip install gunicorn)")
+        sys.exit(1)
     log_level_label = "DEBUG" if args.debug else ("WARNING (quiet)" if args.quiet else "INFO")
 
     print("=" * 65, file=sys.stderr)
@@ -852,12 +1682,20 @@ def main() -> None:
           file=sys.stderr)
     print("=" * 65, file=sys.stderr)
     print(f"  MCP URL   : {CFG['mcp_url']}",  file=sys.stderr)
-    print(f"  MCP Proxy : {CFG['mcp_proxy']}", file=sys.stderr)
+    if args.transport != "stdio":
+        label = "HTTP+SSE" if args.transport == "sse" else "Streamable HTTP"
+        print(f"  Transport : direct {label} (httpx)"
+              + ("  [TLS verify off]" if args.mcp_insecure else ""), file=sys.stderr)
+    else:
+        print(f"  MCP Proxy : {CFG['mcp_proxy']}", file=sys.stderr)
     print(f"  Listen    : {scheme}://{CFG['host']}:{CFG['port']}", file=sys.stderr)
+    print(f"  Server    : {server}" + (f" (1 worker x {args.threads} threads)" if server == "gunicorn" else ""),
+          file=sys.stderr)
     if use_ssl:
         print(f"  TLS cert  : {cert_path}", file=sys.stderr)
         print(f"  TLS key   : {key_path}",  file=sys.stderr)
-    print(f"  Call delay: {CALL_DELAY_S}s between MCP calls", file=sys.stderr)
+    print(f"  Call delay: {CALL_DELAY_S}s between MCP calls (burst {CALL_BURST})", file=sys.stderr)
+    print(f"  In flight : up to {MAX_INFLIGHT} MCP call(s) awaiting a response", file=sys.stderr)
     print(f"  Job timeout: {JOB_TIMEOUT_S}s per HTTP request", file=sys.stderr)
     print(f"  Log level : {log_level_label}", file=sys.stderr)
     if args.log_file:
@@ -865,6 +1703,12 @@ def main() -> None:
     print("=" * 65, file=sys.stderr)
     print(file=sys.stderr)
 
+    if server == "gunicorn":
+        _serve_gunicorn(args.threads,
+                        cert_path if use_ssl else None,
+                        key_path if use_ssl else None)
+        return
+
     start_worker()
     app.run(
         host=CFG["host"],
@@ -15,7 +15,8 @@
 #   --mcp-proxy <path>   mcp-proxy binary    (overrides BRIDGE_MCP_PROXY)
 #   --port     <n>       HTTP port           (default 8080)
 #   --host     <addr>    bind interface      (default 0.0.0.0)
-#   --call-delay <s>     pause between MCP calls (default 1.5)
+#   --call-delay <s>     sustained spacing between MCP calls (default 1.5)
+#   --call-burst <n>     calls allowed back-to-back when idle (default 3)
 #   --debug              enable Flask debug + verbose logging
 #
 # ENVIRONMENT OVERRIDES  (used when no CLI arg is supplied)
@@ -25,6 +26,7 @@
 #   BRIDGE_PORT          HTTP listen port
 #   BRIDGE_HOST          bind interface
 #   BRIDGE_CALL_DELAY    seconds between MCP calls
+#   BRIDGE_CALL_BURST    back-to-back MCP calls allowed when idle
 #   BRIDGE_VENV          path to Python venv (activates it automatically)
 #
 # EXAMPLES
@@ -59,6 +61,7 @@ BRIDGE_SCRIPT="${SCRIPT_DIR}/mcp_web_bridge.py"
 : "${BRIDGE_PORT:=8080}"
 : "${BRIDGE_HOST:=0.0.0.0}"
 : "${BRIDGE_CALL_DELAY:=1.5}"
+: "${BRIDGE_CALL_BURST:=3}"
 : "${BRIDGE_VENV:=}"
 
 # ---------------------------------------------------------------------------
@@ -97,6 +100,7 @@ DEFAULT_ARGS=(
     "--port"       "${BRIDGE_PORT}"
     "--host"       "${BRIDGE_HOST}"
     "--call-delay" "${BRIDGE_CALL_DELAY}"
+    "--call-burst" "${BRIDGE_CALL_BURST}"
 )
 
 # ---------------------------------------------------------------------------
@@ -10,6 +10,8 @@ stats counters, and live AnyLog query responses.
 Requirements
 ------------
     pip install requests
+    pip install orjson          # optional: faster JSON decoding
+    pip install ijson           # optional: scan large query results as they stream
     # Proxy must already be running:
     python anylog_rest_proxy.py
 
@@ -21,26 +23,57 @@ Usage
     python test_anylog_rest_proxy.py --skip-live    # validation-only, no AnyLog calls
     python test_anylog_rest_proxy.py --verbose      # dump response bodies
     python test_anylog_rest_proxy.py --timeout 90   # slow nodes
+    python test_anylog_rest_proxy.py --workers 1    # run tests one at a time
 """
 
 import argparse
+import functools
+import gc
+import itertools
 import json
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson      # optional C JSON codec: pip install orjson
+except ImportError:
+    orjson = None
+
+# Both accept the raw body bytes, which skips requests' charset sniffing.
+_loads = orjson.loads if orjson is not None else json.loads
+
+try:
+    import ijson       # optional incremental JSON parser: pip install ijson
+except ImportError:
+    ijson = None
 
 # ─── ANSI colour helpers ──────────────────────────────────────────────────────
 _TTY = sys.stdout.isatty()
 
-def _c(code, s):  return f"\033[{code}m{s}\033[0m" if _TTY else s
-GRN  = lambda s: _c("32",  s)
-RED  = lambda s: _c("31",  s)
-YEL  = lambda s: _c("33",  s)
-CYN  = lambda s: _c("36",  s)
-DIM  = lambda s: _c("2",   s)
-BOLD = lambda s: _c("1",   s)
+def _c(code, s):  return f"\033[{code}m{s}\033[0m"
+if _TTY:
+    GRN  = lambda s: _c("32",  s)
+    RED  = lambda s: _c("31",  s)
+    YEL  = lambda s: _c("33",  s)
+    CYN  = lambda s: _c("36",  s)
+    DIM  = lambda s: _c("2",   s)
+    BOLD = lambda s: _c("1",   s)
+else:                              # redirected (CI logs): no colour, no wrapper call
+    GRN = RED = YEL = CYN = DIM = BOLD = str
+
+# Fixed tokens, coloured once rather than on every print.
+_PASS_BADGE = GRN("PASS")
+_FAIL_BADGE = RED("FAIL")
+_CROSS      = RED("✗")
+_RULE       = CYN("─" * 66)
+_HRULE      = CYN("═" * 66)
 
 # ─── Globals set in main() ────────────────────────────────────────────────────
 BASE    = "http://localhost:5001"
@@ -48,14 +81,21 @@ DBMS    = "bottle_factory"
 TABLE   = "metric_64"           # Site1 metric table
 TIMEOUT = 60.0
 VERBOSE = False
+WORKERS = 16
 
 # ─── Test registry ────────────────────────────────────────────────────────────
-_results: list[dict] = []          # {name, passed, ms, detail}
-
-def _record(name: str, passed: bool, ms: float, detail: str = ""):
-    _results.append({"name": name, "passed": passed, "ms": ms, "detail": detail})
-    badge  = GRN("PASS") if passed else RED("FAIL")
-    timing = DIM(f"{ms:6.0f}ms")
+_passed   = 0
+_failures: list[tuple] = []        # (name, detail) of each failed test; passes keep no record
+_skipped = 0                       # run_live() tests skipped by --skip-live
+
+def _record(name: str, passed: bool, ms: int, detail: str = ""):
+    global _passed
+    if passed:
+        _passed += 1
+    else:
+        _failures.append((name, detail))
+    badge  = _PASS_BADGE if passed else _FAIL_BADGE
+    timing = DIM(f"{ms:6d}ms")
     print(f"  {badge}  {timing}  {name}")
     if not passed and detail:
         print(f"          {YEL(detail)}")
@@ -65,44 +105,151 @@ def _record(name: str, passed: bool, ms: float, detail: str = ""):
 # ─── HTTP shorthands ──────────────────────────────────────────────────────────
 _S = requests.Session()
 
+def _mount_pool(size: int):
+    """
+    One keep-alive connection per worker, so concurrent tests reuse sockets
+    instead of reconnecting (requests' default pool keeps only 10).  Idempotent
+    requests get two quick retries on connect errors and 502/503/504; the last
+    response is still returned rather than raised.
+    """
+    retry = Retry(total=2, backoff_factor=0.1, status_forcelist=(502, 503, 504),
+                  raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(size, 10),
+                          max_retries=retry)
+    _S.mount("http://", adapter)
+    _S.mount("https://", adapter)
+
+# Full URLs for the fixed paths most tests hit, built once BASE is known.
+_FIXED_PATHS = ("/health", "/stats", "/api/query", "/api/query/increment",
+                "/api/command", "/api/connection/status", "/api/connection/test",
+                "/api/databases", "/api/nodes", "/api/nodes/status")
+_URL: dict = {}
+
+def _build_urls():
+    _URL.clear()
+    _URL.update((p, BASE + p) for p in _FIXED_PATHS)
+
+def _url(path: str) -> str:
+    return _URL.get(path) or BASE + path
+
 def GET(path: str, **kw) -> requests.Response:
-    return _S.get(f"{BASE}{path}", timeout=TIMEOUT, **kw)
+    return _S.get(_url(path), timeout=TIMEOUT, **kw)
 
-def POST(path: str, body: dict = None) -> requests.Response:
-    return _S.post(f"{BASE}{path}", json=body or {}, timeout=TIMEOUT)
+def POST(path: str, body: dict = None, **kw) -> requests.Response:
+    return _S.post(_url(path), json=body or {}, timeout=TIMEOUT, **kw)
 
 def OPTIONS(path: str) -> requests.Response:
     return _S.options(
-        f"{BASE}{path}", timeout=5,
+        _url(path), timeout=5,
         headers={"Origin": "http://localhost",
                  "Access-Control-Request-Method": "POST",
                  "Access-Control-Request-Headers": "Content-Type"},
     )
 
+# Each path's preflight is fetched once; every CORS assertion on that path
+# inspects the same snapshot: (status code, headers with lowercased names),
+# so lookups are plain dict gets.  The lock keeps concurrent tests from all
+# missing the cache at once.
+_preflight_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=None)
+def _preflight_once(path: str) -> tuple:
+    r = OPTIONS(path)
+    return r.status_code, {k.lower(): v for k, v in r.headers.items()}
+
+def _preflight(path: str) -> tuple:
+    with _preflight_lock:
+        return _preflight_once(path)
+
 def _json(resp: requests.Response) -> Any:
     try:
-        return resp.json()
+        return _loads(resp.content)
     except Exception:
         return resp.text
 
+def _scan_rows(resp: requests.Response):
+    """
+    (first_row, row_count) of a JSON-array body, or None if the body is not
+    an array.  With ijson the rows are parsed as they arrive and dropped
+    once counted, so a large result never sits in memory twice; pass
+    stream=True to the request for that to help.  The body may be left
+    partly unread, so the caller closes resp.
+    """
+    if ijson is None:
+        b = _json(resp)
+        return (b[0] if b else None, len(b)) if isinstance(b, list) else None
+    resp.raw.decode_content = True
+    events = ijson.parse(resp.raw, use_float=True)
+    head = next(events, None)
+    if head != ("", "start_array", None):
+        return None
+    first, count = None, 0
+    for row in ijson.items(itertools.chain([head], events), "item"):
+        if count == 0:
+            first = row
+        count += 1
+    return first, count
+
+# Read-only GETs that several tests inspect share one recent response and
+# its parsed body, as do identical rejected POSTs.  A per-key lock makes
+# concurrent callers wait for a single fetch instead of racing it.
+_cached: dict = {}                 # key → (monotonic ts, Response, parsed body)
+_cached_locks: dict = {}
+
+def _fetch_cached(path: str, max_age: float, body: dict = None) -> tuple:
+    key = path if body is None else (path, json.dumps(body, sort_keys=True))
+    with _cached_locks.setdefault(key, threading.Lock()):
+        now = time.monotonic()
+        e = _cached.get(key)
+        if e is None or now - e[0] >= max_age:
+            r = GET(path) if body is None else POST(path, body)
+            e = _cached[key] = (now, r, _json(r))
+        return e
+
+def _get_cached(path: str, max_age: float = 5.0) -> requests.Response:
+    """GET *path*, reusing a response fetched within *max_age* seconds."""
+    return _fetch_cached(path, max_age)[1]
+
+def _get_json_cached(path: str, max_age: float = 5.0) -> Any:
+    """Parsed body of _get_cached(); max_age=0 always fetches."""
+    return _fetch_cached(path, max_age)[2]
+
+def _post_rejected(path: str, body: dict) -> tuple:
+    """(Response, parsed body) for a POST the proxy should reject.  Input
+    validation never reaches AnyLog, so one request per body serves the
+    whole run."""
+    return _fetch_cached(path, float("inf"), body)[1:]
+
+def _expect_400(path: str, body: dict):
+    """Test: POST *body* to *path* → HTTP 400."""
+    def _t():
+        r, _ = _post_rejected(path, body)
+        return r.status_code == 400, f"HTTP {r.status_code} (expected 400)"
+    return _t
+
 # ─── Section header ───────────────────────────────────────────────────────────
-def section(title: str):
-    print(f"\n{CYN('─' * 66)}")
+def _print_section(title: str):
+    print(f"\n{_RULE}")
     print(f"  {BOLD(title)}")
-    print(f"{CYN('─' * 66)}")
+    print(f"{_RULE}")
 
 # ─── Core assertion runner ────────────────────────────────────────────────────
-def check(name: str, fn):
+def _timed(fn) -> tuple:
     """
     fn() must return (passed: bool, detail: str).
-    Wraps timing and records result.
+    Returns (passed, ms, detail); safe to call from any thread.
     """
-    t0 = time.perf_counter()
+    t0 = time.perf_counter_ns()
     try:
         passed, detail = fn()
     except Exception as exc:
         passed, detail = False, f"EXCEPTION: {exc}"
-    ms = (time.perf_counter() - t0) * 1000
+    ms = (time.perf_counter_ns() - t0) // 1_000_000
+    return passed, ms, detail
+
+def check(name: str, fn):
+    """Run one test now and record its result."""
+    passed, ms, detail = _timed(fn)
     _record(name, passed, ms, detail)
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -110,96 +257,102 @@ def check(name: str, fn):
 # Each returns (passed: bool, detail: str)
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Required response fields.  "frozenset - dict.keys()" needs no set(b.keys()) copy.
+_HEALTH_REQUIRED  = frozenset({"status", "service", "anylog_node", "user_agent",
+                               "uptime_sec", "stats"})
+_HEALTH_STATS_SUB = frozenset({"proxy_calls", "anylog_calls", "total_rows", "errors"})
+_STATS_REQUIRED   = frozenset({"proxy_calls", "anylog_calls", "total_rows", "errors",
+                               "uptime_sec", "cache_hits", "cache_misses"})
+_METRIC_COLS      = frozenset({"rest", "availability", "performance", "quality"})
+_CMD_FIELDS       = frozenset({"command", "raw", "rows"})
+
 # ── 1. Health ─────────────────────────────────────────────────────────────────
 
 def t_health_200():
-    r = GET("/health")
+    r = _get_cached("/health")
     return r.status_code == 200, f"HTTP {r.status_code}"
 
 def t_health_required_fields():
-    b = _json(GET("/health"))
-    required = {"status", "service", "anylog_node", "user_agent", "uptime_sec", "stats"}
-    missing  = required - set(b.keys()) if isinstance(b, dict) else required
+    b = _get_json_cached("/health")
+    missing  = _HEALTH_REQUIRED - b.keys() if isinstance(b, dict) else _HEALTH_REQUIRED
     return not missing, f"missing: {missing}" if missing else ""
 
 def t_health_status_healthy():
-    b = _json(GET("/health"))
+    b = _get_json_cached("/health")
     v = b.get("status") if isinstance(b, dict) else None
     return v == "healthy", f"status={v!r}"
 
 def t_health_user_agent():
-    b = _json(GET("/health"))
+    b = _get_json_cached("/health")
     v = b.get("user_agent") if isinstance(b, dict) else None
     return v == "AnyLog/1.23", f"user_agent={v!r} (expected 'AnyLog/1.23')"
 
 def t_health_anylog_protocol():
     """Proxy must reach AnyLog over HTTP not HTTPS."""
-    b = _json(GET("/health"))
+    b = _get_json_cached("/health")
     node = b.get("anylog_node", "") if isinstance(b, dict) else ""
     return ":" in node, f"anylog_node={node!r}"
 
 def t_health_stats_subfields():
-    b = _json(GET("/health"))
+    b = _get_json_cached("/health")
     stats = b.get("stats", {}) if isinstance(b, dict) else {}
-    required = {"proxy_calls", "anylog_calls", "total_rows", "errors"}
-    missing  = required - set(stats.keys())
+    missing  = _HEALTH_STATS_SUB - stats.keys() if isinstance(stats, dict) else _HEALTH_STATS_SUB
     return not missing, f"missing from stats: {missing}" if missing else ""
 
 # ── 2. Stats ──────────────────────────────────────────────────────────────────
 
 def t_stats_200():
-    r = GET("/stats")
+    r = _get_cached("/stats")
     return r.status_code == 200, f"HTTP {r.status_code}"
 
 def t_stats_fields():
-    b = _json(GET("/stats"))
-    required = {"proxy_calls", "anylog_calls", "total_rows", "errors", "uptime_sec"}
-    missing  = required - set(b.keys()) if isinstance(b, dict) else required
+    b = _get_json_cached("/stats")
+    missing  = _STATS_REQUIRED - b.keys() if isinstance(b, dict) else _STATS_REQUIRED
     return not missing, f"missing: {missing}" if missing else ""
 
 def t_stats_no_anylog_call():
     """GET /stats must NOT trigger an AnyLog call (it's local-only)."""
-    before = _json(GET("/stats")).get("anylog_calls", 0)
+    before = _get_json_cached("/stats", max_age=0).get("anylog_calls", 0)
     GET("/stats")
-    after  = _json(GET("/stats")).get("anylog_calls", 0)
+    after  = _get_json_cached("/stats", max_age=0).get("anylog_calls", 0)
     # stats itself is not counted; two extra GETs to /stats should not increment anylog_calls
     return after == before, f"anylog_calls changed {before}→{after} just from /stats calls"
 
 # ── 3. CORS Preflight ─────────────────────────────────────────────────────────
 
 def t_cors_query_preflight():
-    r = OPTIONS("/api/query")
-    ok = r.status_code in (200, 204)
-    return ok, f"HTTP {r.status_code} (expected 200 or 204)"
+    code, _ = _preflight("/api/query")
+    ok = code in (200, 204)
+    return ok, f"HTTP {code} (expected 200 or 204)"
 
 def t_cors_increment_preflight():
-    r = OPTIONS("/api/query/increment")
-    ok = r.status_code in (200, 204)
-    return ok, f"HTTP {r.status_code}"
+    code, _ = _preflight("/api/query/increment")
+    ok = code in (200, 204)
+    return ok, f"HTTP {code}"
 
 def t_cors_command_preflight():
-    r = OPTIONS("/api/command")
-    ok = r.status_code in (200, 204)
-    return ok, f"HTTP {r.status_code}"
+    code, _ = _preflight("/api/command")
+    ok = code in (200, 204)
+    return ok, f"HTTP {code}"
 
 def t_cors_allow_origin_header():
-    r = OPTIONS("/api/query")
-    acao = r.headers.get("Access-Control-Allow-Origin", "")
+    _, h = _preflight("/api/query")
+    acao = h.get("access-control-allow-origin", "")
     return bool(acao), f"Access-Control-Allow-Origin={acao!r}"
 
 def t_cors_allow_methods_header():
-    r = OPTIONS("/api/query")
-    acam = r.headers.get("Access-Control-Allow-Methods", "")
+    _, h = _preflight("/api/query")
+    acam = h.get("access-control-allow-methods", "")
     return bool(acam), f"Access-Control-Allow-Methods={acam!r}"
 
 # ── 4. Connection endpoints ───────────────────────────────────────────────────
 
 def t_conn_status_200():
-    r = GET("/api/connection/status")
+    r = _get_cached("/api/connection/status")
     return r.status_code == 200, f"HTTP {r.status_code}"
 
 def t_conn_status_has_status_field():
-    b = _json(GET("/api/connection/status"))
+    b = _get_json_cached("/api/connection/status")
     return isinstance(b, dict) and "status" in b, f"body={str(b)[:120]}"
 
 def t_conn_test_200():
@@ -213,35 +366,39 @@ def t_conn_test_has_success_field():
 # ── 5. Metadata ───────────────────────────────────────────────────────────────
 
 def t_databases_200():
-    r = GET("/api/databases")
+    r = _get_cached("/api/databases")
     return r.status_code == 200, f"HTTP {r.status_code}"
 
 def t_databases_field():
-    b = _json(GET("/api/databases"))
+    b = _get_json_cached("/api/databases")
     return isinstance(b, dict) and "databases" in b, f"body={str(b)[:120]}"
 
+def t_databases_no_raw_by_default():
+    b = _get_json_cached("/api/databases")
+    return isinstance(b, dict) and "raw" not in b, f"keys={list(b.keys()) if isinstance(b,dict) else '?'}"
+
 def t_tables_200():
-    r = GET(f"/api/databases/{DBMS}/tables")
+    r = _get_cached(f"/api/databases/{DBMS}/tables")
     return r.status_code == 200, f"HTTP {r.status_code}"
 
 def t_tables_field():
-    b = _json(GET(f"/api/databases/{DBMS}/tables"))
+    b = _get_json_cached(f"/api/databases/{DBMS}/tables")
     return isinstance(b, dict) and "tables" in b, f"body={str(b)[:120]}"
 
 def t_columns_200():
-    r = GET(f"/api/databases/{DBMS}/tables/{TABLE}/columns")
+    r = _get_cached(f"/api/databases/{DBMS}/tables/{TABLE}/columns")
     return r.status_code == 200, f"HTTP {r.status_code}"
 
 def t_columns_field():
-    b = _json(GET(f"/api/databases/{DBMS}/tables/{TABLE}/columns"))
+    b = _get_json_cached(f"/api/databases/{DBMS}/tables/{TABLE}/columns")
     return isinstance(b, dict) and "columns" in b, f"body={str(b)[:120]}"
 
 def t_nodes_200():
-    r = GET("/api/nodes")
+    r = _get_cached("/api/nodes")
     return r.status_code == 200, f"HTTP {r.status_code}"
 
 def t_nodes_field():
-    b = _json(GET("/api/nodes"))
+    b = _get_json_cached("/api/nodes")
     return isinstance(b, dict) and "nodes" in b, f"body={str(b)[:120]}"
 
 def t_node_status_get():
@@ -262,25 +419,18 @@ def t_data_location_field():
 
 # ── 6. POST /api/query — input validation ────────────────────────────────────
 
-def t_query_missing_dbms():
-    r = POST("/api/query", {"sql": "SELECT 1"})
-    return r.status_code == 400, f"HTTP {r.status_code} (expected 400)"
-
-def t_query_missing_sql():
-    r = POST("/api/query", {"dbms": DBMS})
-    return r.status_code == 400, f"HTTP {r.status_code} (expected 400)"
-
-def t_query_empty_body():
-    r = POST("/api/query", {})
-    return r.status_code == 400, f"HTTP {r.status_code} (expected 400)"
-
-def t_query_whitespace_only_dbms():
-    r = POST("/api/query", {"dbms": "   ", "sql": "SELECT 1"})
-    return r.status_code == 400, f"HTTP {r.status_code} (expected 400)"
+def _bad_query_bodies() -> list:
+    """(name, body) cases that POST /api/query must reject with 400."""
+    return [
+        ("missing 'dbms' → HTTP 400",  {"sql": "SELECT 1"}),
+        ("missing 'sql'  → HTTP 400",  {"dbms": DBMS}),
+        ("empty body     → HTTP 400",  {}),
+        ("whitespace dbms → HTTP 400", {"dbms": "   ", "sql": "SELECT 1"}),
+    ]
 
 def t_query_error_body_has_error_field():
     """Error responses must have an 'error' key (from _err())."""
-    b = _json(POST("/api/query", {}))
+    _, b = _post_rejected("/api/query", {})
     return isinstance(b, dict) and "error" in b, f"body={str(b)[:120]}"
 
 # ── 7. POST /api/query — live AnyLog queries ─────────────────────────────────
@@ -292,17 +442,18 @@ def t_query_rest_metrics():
         "sql":  (f"SELECT avg(rest) as rest, avg(availability) as availability, "
                  f"avg(performance) as performance, avg(quality) as quality "
                  f"FROM {TABLE} WHERE insert_timestamp >= NOW() - 4 hours"),
-    })
-    b = _json(r)
-    if not r.ok:
-        return False, f"HTTP {r.status_code}  error={b.get('error','') if isinstance(b,dict) else b}"
-    if not isinstance(b, list):
-        return False, f"Expected list, got {type(b).__name__}: {str(b)[:150]}"
-    if len(b) == 0:
+    }, stream=True)
+    with r:                                 # _scan_rows may stop mid-body
+        if not r.ok:
+            b = _json(r)
+            return False, f"HTTP {r.status_code}  error={b.get('error','') if isinstance(b,dict) else b}"
+        scan = _scan_rows(r)
+    if scan is None:
+        return False, "Expected a JSON array, got another shape"
+    row, count = scan
+    if count == 0:
         return True, "Empty result — no data in last 4h window (may be normal)"
-    row = b[0]
-    cols = {"rest", "availability", "performance", "quality"}
-    missing = cols - set(row.keys())
+    missing = _METRIC_COLS - row.keys()
     if missing:
         return False, f"Missing columns {missing} in row: {row}"
     rest_pct = float(row["rest"]) * 100
@@ -316,11 +467,15 @@ def t_query_returns_list():
     r = POST("/api/query", {
         "dbms": DBMS,
         "sql":  f"SELECT * FROM {TABLE} LIMIT 3",
-    })
-    b = _json(r)
-    if not r.ok:
-        return False, f"HTTP {r.status_code}  {b.get('error','') if isinstance(b,dict) else b}"
-    return isinstance(b, list), f"type={type(b).__name__}  body={str(b)[:120]}"
+    }, stream=True)
+    with r:                                 # _scan_rows may stop mid-body
+        if not r.ok:
+            b = _json(r)
+            return False, f"HTTP {r.status_code}  {b.get('error','') if isinstance(b,dict) else b}"
+        scan = _scan_rows(r)
+    if scan is None:
+        return False, "not a JSON array"
+    return True, f"rows={scan[1]}  first={str(scan[0])[:100]}"
 
 def t_query_insert_timestamp_works():
     """Confirm insert_timestamp is the correct time column (not 'timestamp')."""
@@ -353,12 +508,12 @@ def t_query_bad_table_no_crash():
 
 def t_query_stats_increment():
     """proxy_calls and anylog_calls must both increment after a /api/query call."""
-    before = _json(GET("/stats"))
+    before = _get_json_cached("/stats", max_age=0)
     POST("/api/query", {
         "dbms": DBMS,
         "sql":  f"SELECT avg(rest) as rest FROM {TABLE} WHERE insert_timestamp >= NOW() - 1 hour",
     })
-    after = _json(GET("/stats"))
+    after = _get_json_cached("/stats", max_age=0)
     pc_ok = after.get("proxy_calls", 0)  > before.get("proxy_calls", 0)
     al_ok = after.get("anylog_calls", 0) > before.get("anylog_calls", 0)
     detail = []
@@ -368,20 +523,18 @@ def t_query_stats_increment():
 
 # ── 8. POST /api/query/increment — input validation ──────────────────────────
 
-def t_incr_missing_dbms():
-    r = POST("/api/query/increment", {"table": TABLE})
-    return r.status_code == 400, f"HTTP {r.status_code} (expected 400)"
-
-def t_incr_missing_table():
-    r = POST("/api/query/increment", {"dbms": DBMS})
-    return r.status_code == 400, f"HTTP {r.status_code} (expected 400)"
-
-def t_incr_empty_body():
-    r = POST("/api/query/increment", {})
-    return r.status_code == 400, f"HTTP {r.status_code} (expected 400)"
+def _bad_incr_bodies() -> list:
+    """(name, body) cases that POST /api/query/increment must reject with 400."""
+    return [
+        ("missing 'dbms'  → HTTP 400",      {"table": TABLE}),
+        ("missing 'table' → HTTP 400",      {"dbms": DBMS}),
+        ("empty body      → HTTP 400",      {}),
+        ("unknown timeUnit → HTTP 400",     {"dbms": DBMS, "table": TABLE, "timeUnit": "fortnight"}),
+        ("non-identifier table → HTTP 400", {"dbms": DBMS, "table": f"{TABLE}; drop table {TABLE}"}),
+    ]
 
 def t_incr_error_has_error_field():
-    b = _json(POST("/api/query/increment", {}))
+    _, b = _post_rejected("/api/query/increment", {})
     return isinstance(b, dict) and "error" in b, f"body={str(b)[:120]}"
 
 # ── 9. POST /api/query/increment — live ──────────────────────────────────────
@@ -419,26 +572,26 @@ def t_incr_default_time_column():
 
 # ── 10. POST /api/command ─────────────────────────────────────────────────────
 
-def t_command_missing_field():
-    r = POST("/api/command", {})
-    return r.status_code == 400, f"HTTP {r.status_code} (expected 400)"
-
-def t_command_empty_string():
-    r = POST("/api/command", {"command": ""})
-    return r.status_code == 400, f"HTTP {r.status_code} (expected 400)"
-
-def t_command_whitespace_only():
-    r = POST("/api/command", {"command": "   "})
-    return r.status_code == 400, f"HTTP {r.status_code} (expected 400)"
+def _bad_command_bodies() -> list:
+    """(name, body) cases that POST /api/command must reject with 400."""
+    return [
+        ("missing 'command' field → HTTP 400", {}),
+        ("empty string command    → HTTP 400", {"command": ""}),
+        ("whitespace-only command → HTTP 400", {"command": "   "}),
+        ("non-numeric timeout     → HTTP 400", {"command": "get status", "timeout": "soon"}),
+        ("negative timeout        → HTTP 400", {"command": "get status", "timeout": -5}),
+        ("non-finite timeout      → HTTP 400", {"command": "get status", "timeout": "nan"}),
+        ("non-boolean parse       → HTTP 400", {"command": "get status", "parse": "false"}),
+    ]
 
 def t_command_error_has_error_field():
-    b = _json(POST("/api/command", {}))
+    _, b = _post_rejected("/api/command", {})
     return isinstance(b, dict) and "error" in b, f"body={str(b)[:120]}"
 
 def t_command_get_status():
     r = POST("/api/command", {"command": "get status"})
     b = _json(r)
-    ok = r.ok and isinstance(b, dict) and "command" in b and "raw" in b and "rows" in b
+    ok = r.ok and isinstance(b, dict) and _CMD_FIELDS <= b.keys()
     return ok, f"HTTP {r.status_code}  fields={list(b.keys()) if isinstance(b,dict) else '?'}"
 
 def t_command_get_databases():
@@ -452,7 +605,7 @@ def t_command_response_fields():
     b = _json(POST("/api/command", {"command": "get status"}))
     if not isinstance(b, dict):
         return False, f"not a dict: {str(b)[:100]}"
-    missing = {"command", "raw", "rows"} - set(b.keys())
+    missing = _CMD_FIELDS - b.keys()
     return not missing, f"missing fields: {missing}" if missing else f"command={b.get('command')!r}"
 
 # ── 11. Error response shape ──────────────────────────────────────────────────
@@ -467,7 +620,7 @@ def t_error_shape_400():
     failures = []
     for path, body in endpoints:
         try:
-            b = _json(POST(path, body))
+            _, b = _post_rejected(path, body)
             if not (isinstance(b, dict) and "error" in b):
                 failures.append(f"{path}: {str(b)[:80]}")
         except Exception as exc:
@@ -483,8 +636,8 @@ def t_404_unknown_route():
 # ── 5B. UNS Policies ─────────────────────────────────────────────────────────
 
 def t_uns_root_policies_get():
-    """GET /api/uns should return dict with command, policies, raw."""
-    r = GET("/api/uns")
+    """GET /api/uns?debug=1 should return dict with command, policies, raw."""
+    r = GET("/api/uns?debug=1")
     b = _json(r)
     if r.status_code != 200:
         return False, f"HTTP {r.status_code}  body={str(b)[:150]}"
@@ -504,7 +657,7 @@ def t_uns_root_policies_get():
 # ─── Reachability check ───────────────────────────────────────────────────────
 def check_reachable():
     try:
-        r = requests.get(f"{BASE}/health", timeout=5)
+        r = _S.get(_url("/health"), timeout=5)
         return True, r.status_code
     except requests.exceptions.ConnectionError:
         return False, None
@@ -518,18 +671,48 @@ def check_reachable():
 # ═══════════════════════════════════════════════════════════════════════════════
 # RUNNER
 # ═══════════════════════════════════════════════════════════════════════════════
-def run(name: str, fn):
-    check(name, fn)
+# main() only registers sections and tests; _execute() runs them.  Tests are
+# independent single requests, so they run on a thread pool while the main
+# thread prints results in registration order.  serial=True tests read
+# /stats counters that concurrent queries would move; they run one at a
+# time once the pool has drained.
+_plan: list[tuple] = []            # ("section", title) | ("test", name, fn, skip, serial)
 
-def run_live(name: str, fn, skip: bool):
-    if skip:
-        print(f"  {DIM('SKIP')}           {DIM(name)}")
-    else:
-        check(name, fn)
+def section(title: str):
+    _plan.append(("section", title))
+
+def run(name: str, fn, serial: bool = False):
+    _plan.append(("test", name, fn, False, serial))
+
+def run_live(name: str, fn, skip: bool, serial: bool = False):
+    _plan.append(("test", name, fn, skip, serial))
+
+def _execute(workers: int):
+    global _skipped
+    ex = ThreadPoolExecutor(max_workers=max(1, workers))
+    futures = {id(e): ex.submit(_timed, e[2]) for e in _plan
+               if e[0] == "test" and not e[3] and not e[4]}
+    drained = False
+    for e in _plan:
+        if e[0] == "section":
+            _print_section(e[1])
+            continue
+        _, name, fn, skip, serial = e
+        if skip:
+            _skipped += 1
+            print(f"  {DIM('SKIP')}           {DIM(name)}")
+        elif serial:
+            if not drained:
+                ex.shutdown(wait=True)
+                drained = True
+            check(name, fn)
+        else:
+            _record(name, *futures[id(e)].result())
+    ex.shutdown(wait=True)
 
 
 def main():
-    global BASE, DBMS, TABLE, TIMEOUT, VERBOSE
+    global BASE, DBMS, TABLE, TIMEOUT, VERBOSE, WORKERS
 
     p = argparse.ArgumentParser(description="Test suite for anylog_rest_proxy.py")
     p.add_argument("--url",       default="http://localhost:8080", help="Proxy base URL")
@@ -538,6 +721,7 @@ def main():
     p.add_argument("--timeout",   type=float, default=60.0,        help="Request timeout seconds (default: 60)")
     p.add_argument("--skip-live", action="store_true",             help="Skip tests that make live AnyLog queries")
     p.add_argument("--verbose",   action="store_true",             help="Print detail for passing tests too")
+    p.add_argument("--workers",   type=int, default=16,            help="Tests run concurrently (default: 16; 1 = serial)")
     args = p.parse_args()
 
     raw_url = args.url.rstrip("/")
@@ -548,14 +732,17 @@ def main():
     TABLE   = args.table
     TIMEOUT = args.timeout
     VERBOSE = args.verbose
+    WORKERS = args.workers
     skip    = args.skip_live
+    _mount_pool(WORKERS)
+    _build_urls()
 
-    print(f"\n{CYN('═' * 66)}")
+    print(f"\n{_HRULE}")
     print(f"  {BOLD('AnyLog rest Proxy — Test Suite')}")
-    print(f"{CYN('═' * 66)}")
+    print(f"{_HRULE}")
     print(f"  Proxy    : {BOLD(BASE)}")
     print(f"  Database : {BOLD(DBMS)}    Table: {BOLD(TABLE)}")
-    print(f"  Timeout  : {TIMEOUT}s    Skip-live: {skip}")
+    print(f"  Timeout  : {TIMEOUT}s    Skip-live: {skip}    Workers: {WORKERS}")
 
     # Reachability gate
     print(f"\n  Checking proxy reachability … ", end="", flush=True)
@@ -580,7 +767,7 @@ def main():
     section("2  Stats")
     run("GET /stats → HTTP 200",                        t_stats_200)
     run("GET /stats → required counter fields",         t_stats_fields)
-    run("GET /stats → no AnyLog call triggered",        t_stats_no_anylog_call)
+    run("GET /stats → no AnyLog call triggered",        t_stats_no_anylog_call, serial=True)
 
     section("3  CORS Preflight")
     run("OPTIONS /api/query → 200 or 204",              t_cors_query_preflight)
@@ -598,6 +785,7 @@ def main():
     section("5  Metadata Discovery")
     run("GET /api/databases → HTTP 200",                t_databases_200)
     run("GET /api/databases → 'databases' field",       t_databases_field)
+    run("GET /api/databases → no 'raw' without ?debug", t_databases_no_raw_by_default)
     run(f"GET /api/databases/{DBMS}/tables → 200",     t_tables_200)
     run(f"GET /api/databases/{DBMS}/tables → 'tables'",t_tables_field)
     run(f"GET …/{TABLE}/columns → 200",                t_columns_200)
@@ -611,10 +799,8 @@ def main():
     run_live("GET /api/uns → blockchain get root policies", t_uns_root_policies_get, skip)
 
     section("6  POST /api/query — Input Validation")
-    run("missing 'dbms' → HTTP 400",                    t_query_missing_dbms)
-    run("missing 'sql'  → HTTP 400",                    t_query_missing_sql)
-    run("empty body     → HTTP 400",                    t_query_empty_body)
-    run("whitespace dbms → HTTP 400",                   t_query_whitespace_only_dbms)
+    for name, body in _bad_query_bodies():
+        run(name, _expect_400("/api/query", body))
     run("error response has 'error' field",             t_query_error_body_has_error_field)
 
     section("7  POST /api/query — Live AnyLog Queries")
@@ -629,12 +815,11 @@ def main():
     run_live("non-existent table → handled error, not proxy 500",
              t_query_bad_table_no_crash, skip)
     run_live("proxy_calls + anylog_calls increment after query",
-             t_query_stats_increment, skip)
+             t_query_stats_increment, skip, serial=True)
 
     section("8  POST /api/query/increment — Input Validation")
-    run("missing 'dbms'  → HTTP 400",                   t_incr_missing_dbms)
-    run("missing 'table' → HTTP 400",                   t_incr_missing_table)
-    run("empty body      → HTTP 400",                   t_incr_empty_body)
+    for name, body in _bad_incr_bodies():
+        run(name, _expect_400("/api/query/increment", body))
     run("error response has 'error' field",             t_incr_error_has_error_field)
 
     section("9  POST /api/query/increment — Live AnyLog Queries")
@@ -644,9 +829,8 @@ def main():
              t_incr_default_time_column, skip)
 
     section("10  POST /api/command")
-    run("missing 'command' field → HTTP 400",           t_command_missing_field)
-    run("empty string command    → HTTP 400",           t_command_empty_string)
-    run("whitespace-only command → HTTP 400",           t_command_whitespace_only)
+    for name, body in _bad_command_bodies():
+        run(name, _expect_400("/api/command", body))
     run("error response has 'error' field",             t_command_error_has_error_field)
     run_live("'get status'    → command+raw+rows fields",t_command_get_status,   skip)
     run_live("'get databases' → raw field present",      t_command_get_databases, skip)
@@ -656,29 +840,37 @@ def main():
     run("all 400 errors return JSON with 'error' key",  t_error_shape_400)
     run("unknown route → HTTP 404 (not 500)",           t_404_unknown_route)
 
+    # Everything allocated so far (modules, session, the test plan) lives for
+    # the whole run: move it out of the collector's view, and let the nursery
+    # grow so per-request garbage doesn't trigger collections mid-timing.
+    gc.collect()
+    gc.freeze()
+    gc.set_threshold(100_000, 50, 10)
+    _execute(WORKERS)
+
     # ──────────────────────────────────────────────────────────────────────────
     # Summary
     # ──────────────────────────────────────────────────────────────────────────
-    total   = len(_results)
-    passed  = sum(1 for r in _results if r["passed"])
-    failed  = total - passed
-    skipped = sum(1 for line in open(sys.argv[0]).readlines()
-                  if "SKIP" in line)  # rough count only
+    passed  = _passed
+    failed  = len(_failures)
+    total   = passed + failed
+    skipped = _skipped
 
-    print(f"\n{CYN('═' * 66)}")
+    print(f"\n{_HRULE}")
     print(f"  {BOLD('RESULTS')}")
-    print(f"{CYN('═' * 66)}")
+    print(f"{_HRULE}")
     print(f"  Total   : {total}")
     print(f"  {GRN('Passed')}  : {GRN(str(passed))}")
     print(f"  {(RED('Failed') if failed else DIM('Failed'))}  : {(RED(str(failed)) if failed else DIM('0'))}")
+    if skipped:
+        print(f"  {DIM('Skipped')} : {DIM(str(skipped))}")
 
     if failed:
         print(f"\n  {RED(BOLD('FAILED TESTS:'))}")
-        for r in _results:
-            if not r["passed"]:
-                print(f"    {RED('✗')} {r['name']}")
-                if r["detail"]:
-                    print(f"        {YEL(r['detail'])}")
+        for name, detail in _failures:
+            print(f"    {_CROSS} {name}")
+            if detail:
+                print(f"        {YEL(detail)}")
 
     verdict = GRN(BOLD("ALL TESTS PASSED")) if not failed else RED(BOLD(f"{failed} TEST(S) FAILED"))
     print(f"\n  {verdict}\n")